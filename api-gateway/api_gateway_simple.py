@@ -5,23 +5,69 @@ Main entry point with SQLite storage instead of Redis
 """
 
 import os
+from importlib.util import find_spec
+
+# Socket.IO async mode: SOCKETIO_ASYNC_MODE, else eventlet when installed
+# (one green thread per client), else plain threads. eventlet/gevent must
+# monkey-patch the stdlib before anything else (requests, threading, sqlite
+# helpers) is imported.
+SOCKETIO_ASYNC_MODE = os.getenv("SOCKETIO_ASYNC_MODE") or (
+    "eventlet" if find_spec("eventlet") else "threading"
+)
+if SOCKETIO_ASYNC_MODE == "eventlet":
+    import eventlet
+    eventlet.monkey_patch()
+elif SOCKETIO_ASYNC_MODE == "gevent":
+    from gevent import monkey
+    monkey.patch_all()
+
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import threading
 import time
 import uuid
+import hashlib
+import socket
+import stat
+import psutil
+from collections import Counter, OrderedDict, deque
+from dataclasses import asdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
 import requests
-from datetime import datetime
+from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 from flask import Flask, jsonify, request, current_app
 from flask_cors import CORS
 from flask_socketio import SocketIO, emit, join_room, leave_room
 import structlog
 
 # Import our modules
+from shared.clock import iso_now
 from shared.config import config
 
-from shared.db import get_db_connection
+from shared.db import ConnectionPool, get_db_connection
+from shared.json_utils import (
+    OrjsonProvider,
+    SocketIOJSON,
+    dumps_bytes,
+    orjson_response,
+)
+from shared.logging_setup import (
+    configure_queue_logging,
+    configure_structlog,
+    quiet_access_log,
+)
 from auth import init_auth_service, require_auth
+from schemas import (
+    AddJobRequest,
+    CreateTabRequest,
+    CredentialsRequest,
+    SchemaError,
+    parse_body,
+)
 from shared.job_queue import ConversionJob, JobStatus
 
 # Create logs directory if it doesn't exist
@@ -29,81 +75,164 @@ os.makedirs("logs", exist_ok=True)
 os.makedirs("data", exist_ok=True)
 
 # Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(),
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+configure_structlog()
+configure_queue_logging()
+# Health probes and Socket.IO long-polling would otherwise log every hit
+quiet_access_log(paths=("/health",), prefixes=("/socket.io/",))
 
 logger = structlog.get_logger()
 
 # Initialize Flask app
 app = Flask(__name__)
 app.config["SECRET_KEY"] = config.security.jwt_secret_key
+app.json = OrjsonProvider(app)
+
+# Allowed browser origins, shared by the REST API and Socket.IO ("*" allows any)
+CORS_ORIGINS = frozenset(
+    origin.strip()
+    for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    if origin.strip()
+)
 
 # Configure CORS
 CORS(app, resources={
     r"/api/*": {
-        "origins": os.getenv("CORS_ORIGINS", "http://localhost:3000").split(","),
+        "origins": sorted(CORS_ORIGINS),
         "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         "allow_headers": ["Content-Type", "Authorization"]
     }
 })
 
-# Initialize SocketIO
+# Per-packet Socket.IO / Engine.IO logging, off unless SOCKETIO_DEBUG=1
+SOCKETIO_DEBUG = os.getenv("SOCKETIO_DEBUG") == "1"
+# Optional pub/sub URL (e.g. redis://redis:6379/0) so emits reach clients held
+# by other gateway workers; needs the matching client package (redis)
+SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE") or None
+
+# Initialize SocketIO. Engine.IO before 4.13 only treats the bare string "*"
+# as "any origin", and its origin check takes a list.
 socketio = SocketIO(
     app,
-    cors_allowed_origins="*",
-    async_mode="threading",
-    logger=True,
-    engineio_logger=True,
+    cors_allowed_origins="*" if "*" in CORS_ORIGINS else sorted(CORS_ORIGINS),
+    async_mode=SOCKETIO_ASYNC_MODE,
+    json=SocketIOJSON,
+    logger=SOCKETIO_DEBUG,
+    engineio_logger=SOCKETIO_DEBUG,
+    message_queue=SOCKETIO_MESSAGE_QUEUE,
 )
 
 # Environment variables
 HANDBRAKE_SERVICE_URL = os.getenv("HANDBRAKE_SERVICE_URL", "http://localhost:8081")
+DB_PATH = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
+# Host-side mount sources, shown next to the container paths in the file browser
+MEDIA_INPUT_HOST_PATH = os.getenv("MEDIA_INPUT_PATH", "/media/input")
+MEDIA_OUTPUT_HOST_PATH = os.getenv("MEDIA_OUTPUT_PATH", "/media/output")
+
+# Upper bound on pooled sockets to the HandBrake service; roughly two per
+# concurrent request handler.
+HANDBRAKE_POOL_MAXSIZE = int(os.getenv("HANDBRAKE_POOL_MAXSIZE", "64"))
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled sockets enable TCP keepalive."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = HTTPConnection.default_socket_options + [
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+        ]
+        super().init_poolmanager(*args, **kwargs)
+
+
+# Shared HTTP session for HandBrake service calls. Keeps sockets alive across
+# requests and the realtime update loop instead of reconnecting per call.
+_hb_session = requests.Session()
+_hb_session.headers["User-Agent"] = f"api-gateway/{os.getpid()}"
+_hb_adapter = _KeepAliveAdapter(
+    pool_connections=4,
+    pool_maxsize=HANDBRAKE_POOL_MAXSIZE,
+    # Retry transient gateway errors on idempotent methods only (the default
+    # allowed_methods excludes POST); the last response is returned as-is.
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.1,
+        status_forcelist=(502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+# Mounted on the HandBrake origin only; any other URL keeps requests' defaults.
+_hb_session.mount(HANDBRAKE_SERVICE_URL.rstrip("/") + "/", _hb_adapter)
 
 # Initialize auth service
 auth_service = init_auth_service(config)
 app.auth_service = auth_service
 
 
+# Set whenever job state changes so the realtime loop broadcasts right away
+# instead of waiting out its heartbeat interval. Changes made by the HandBrake
+# service arrive through POST /api/handbrake/event.
+_jobs_dirty = threading.Event()
+
+# Longest gap between realtime broadcasts when nothing changed; this heartbeat
+# mostly carries system resource figures.
+REALTIME_HEARTBEAT_SECONDS = float(os.getenv("REALTIME_HEARTBEAT_SECONDS", "30"))
+
+# Number of connected Socket.IO clients; the realtime loop idles when zero.
+_connected_clients = 0
+_connected_clients_lock = threading.Lock()
+
+
 # Socket.IO Event Handlers
+# Room every client joins on connect; realtime broadcasts go to it, so a client
+# can opt out with leave_room and keep only its private events
+BROADCAST_ROOM = "broadcast"
+
+
+def _user_room(user_id):
+    """Socket.IO room that receives one user's private events (e.g. tabs_changed)"""
+    return f"user:{user_id}"
+
+
 @socketio.on("connect")
-def handle_connect():
-    """Handle client WebSocket connection"""
-    logger.info(f"Client connected: {request.sid}")
+def handle_connect(auth=None):
+    """Handle client WebSocket connection.
+
+    Clients that pass a JWT (``auth={"token": ...}`` or ``?token=``) join their
+    user room; anonymous clients still get the shared broadcasts.
+    """
+    global _connected_clients
+    with _connected_clients_lock:
+        _connected_clients += 1
+    _last_broadcast_digests.clear()
+    _jobs_dirty.set()
+    join_room(BROADCAST_ROOM)
+    token = (auth or {}).get("token") or request.args.get("token")
+    if token:
+        user_info = auth_service.verify_token(token)
+        if user_info:
+            join_room(_user_room(user_info["id"]))
+    logger.debug(f"Client connected: {request.sid}")
     emit("connected", {"message": "Connected to HandBrake2Resilio API Gateway"})
 
 
 @socketio.on("disconnect")
 def handle_disconnect():
     """Handle client WebSocket disconnection"""
-    logger.info(f"Client disconnected: {request.sid}")
+    global _connected_clients
+    with _connected_clients_lock:
+        _connected_clients = max(0, _connected_clients - 1)
+    logger.debug(f"Client disconnected: {request.sid}")
 
 
 @socketio.on("request_system_update")
 def handle_system_update_request():
     """Handle system update request from client"""
     try:
-        handbrake_status = get_handbrake_service_status()
-        jobs = get_all_jobs_from_db()
+        handbrake_status, jobs = _fetch_status_and_jobs()
 
         emit(
             "system_update",
             {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": iso_now(),
                 "handbrake_service": handbrake_status,
                 "jobs": jobs,
             },
@@ -143,11 +272,26 @@ def handle_leave_room(data):
 
 
 # Initialize SQLite database for job tracking
+# Pooled connections shared by every DB helper and /health, so page and
+# statement caches stay warm between requests. Size it to the number of
+# request threads that hit the database at the same time.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
+_db_pool = ConnectionPool(
+    DB_PATH,
+    size=DB_POOL_SIZE,
+    # WAL/synchronous/busy_timeout come from get_db_connection
+    pragmas=(
+        "PRAGMA cache_size=-16384",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA mmap_size=268435456",
+    ),
+    cached_statements=256,
+)
+
+
 def init_job_database():
     """Initialize SQLite database for job tracking"""
-    db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
-
-    with get_db_connection(db_path) as conn:
+    with _db_pool.transaction() as conn:
         conn.executescript(
             """
             CREATE TABLE IF NOT EXISTS jobs (
@@ -167,33 +311,92 @@ def init_job_database():
                 started_at TIMESTAMP,
                 completed_at TIMESTAMP
             );
-            CREATE TABLE IF NOT EXISTS scans (
+            CREATE TABLE IF NOT EXISTS scan_meta (
                 path TEXT PRIMARY KEY,
-                content TEXT,
-                last_scanned TIMESTAMP
+                last_scanned TIMESTAMP,
+                file_count INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS scan_files (
+                path TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                name TEXT,
+                full_path TEXT,
+                relative_path TEXT,
+                size INTEGER,
+                modified TEXT,
+                PRIMARY KEY (path, idx)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS scan_jobs (
+                id TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                status TEXT NOT NULL,
+                file_count INTEGER,
+                error TEXT,
+                started_at TIMESTAMP,
+                completed_at TIMESTAMP
             );
+            CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC);
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
             """
         )
-        conn.commit()
+        conn.execute("PRAGMA wal_autocheckpoint=1000")
+        # Scans run in this process's executor, so any still marked running
+        # were cut off by a restart and will never finish
+        conn.execute(
+            "UPDATE scan_jobs SET status = 'failed', error = ?, completed_at = ?"
+            " WHERE status = 'running'",
+            ("Interrupted by a gateway restart", datetime.now().isoformat()),
+        )
+        _prune_scan_jobs(conn)
         logger.info("Job and Scan databases initialized")
 
 
+# Finished scan_jobs rows are kept this long for status polling
+SCAN_JOB_RETENTION = timedelta(days=1)
+
+
+def _prune_scan_jobs(conn):
+    """Delete finished scan_jobs rows older than SCAN_JOB_RETENTION"""
+    cutoff = (datetime.now() - SCAN_JOB_RETENTION).isoformat()
+    conn.execute(
+        "DELETE FROM scan_jobs WHERE status != 'running' AND completed_at < ?",
+        (cutoff,),
+    )
+
+
 # Initialize database
 init_job_database()
 
 
-def get_cached_scan(path):
-    """Get cached scan results from database"""
-    db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
+def get_cached_scan(path, limit=100):
+    """Get a page of cached scan results from database.
+
+    Reads the scan's metadata row and only the first ``limit`` file rows,
+    assembling the page as JSON inside SQLite. Returns ``last_scanned``,
+    ``file_count`` and ``files_json`` (the page as JSON text), or None.
+    """
     try:
-        with get_db_connection(db_path) as conn:
-            cursor = conn.execute("SELECT content, last_scanned FROM scans WHERE path = ?", (path,))
+        with _db_pool.connection() as conn:
+            cursor = conn.execute(
+                """
+                SELECT last_scanned, file_count,
+                       (SELECT json_group_array(json_object(
+                            'name', name, 'path', full_path,
+                            'relative_path', relative_path,
+                            'size', size, 'modified', modified))
+                        FROM (SELECT * FROM scan_files
+                              WHERE path = scan_meta.path
+                              ORDER BY idx LIMIT ?))
+                FROM scan_meta WHERE path = ?
+                """,
+                (limit, path),
+            )
             row = cursor.fetchone()
             if row:
-                import json
                 return {
-                    "content": json.loads(row[0]),
-                    "last_scanned": row[1]
+                    "last_scanned": row[0],
+                    "file_count": row[1],
+                    "files_json": row[2],
                 }
     except Exception as e:
         logger.error(f"Error getting cached scan: {e}")
@@ -201,59 +404,157 @@ def get_cached_scan(path):
 
 
 def save_scan_to_db(path, content):
-    """Save scan results to database"""
-    db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
-    try:
-        import json
-        with get_db_connection(db_path) as conn:
-            conn.execute(
-                "INSERT OR REPLACE INTO scans (path, content, last_scanned) VALUES (?, ?, ?)",
-                (path, json.dumps(content), datetime.now().isoformat())
-            )
-            conn.commit()
-    except Exception as e:
-        logger.error(f"Error saving scan to db: {e}")
+    """Replace the cached scan of ``path`` with ``content``, one row per file.
+
+    Errors propagate so run_scan can report the scan as failed.
+    """
+    with _db_pool.transaction() as conn:
+        conn.execute("DELETE FROM scan_files WHERE path = ?", (path,))
+        conn.executemany(
+            "INSERT INTO scan_files (path, idx, name, full_path, relative_path, size, modified)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                (path, idx, f["name"], f["path"], f["relative_path"], f["size"], f["modified"])
+                for idx, f in enumerate(content)
+            ),
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO scan_meta (path, last_scanned, file_count) VALUES (?, ?, ?)",
+            (path, datetime.now().isoformat(), len(content))
+        )
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v')
+# Suffixes without the dot, for one set lookup per file name
+_VIDEO_EXT_SET = frozenset(ext.lstrip('.') for ext in VIDEO_EXTENSIONS)
 
 
 def scan_directory_recursive(path):
-    """Recursively scan directory for video files"""
-    video_extensions = ('.mp4', '.mkv', '.avi', '.mov', '.wmv', '.flv', '.webm', '.m4v')
+    """Recursively scan directory for video files.
+
+    Walks with os.scandir so each entry's type (and, for regular files, its
+    stat) comes from the directory read. Subdirectories are visited in inode
+    order, which roughly follows on-disk layout on spinning disks.
+    """
     results = []
-    
-    try:
-        for root, dirs, files in os.walk(path):
-            for file in files:
-                if file.lower().endswith(video_extensions):
-                    full_path = os.path.join(root, file)
+    prefix_len = len(path.rstrip(os.sep)) + 1
+    pending = [path]
+
+    while pending:
+        directory = pending.pop()
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
                     try:
-                        stats = os.stat(full_path)
-                        results.append({
-                            "name": file,
-                            "path": full_path,
-                            "relative_path": os.path.relpath(full_path, path),
-                            "size": stats.st_size,
-                            "modified": datetime.fromtimestamp(stats.st_mtime).isoformat()
-                        })
-                    except Exception:
-                        results.append({
-                            "name": file,
-                            "path": full_path,
-                            "relative_path": os.path.relpath(full_path, path),
-                            "size": 0,
-                            "modified": None
-                        })
-    except Exception as e:
-        logger.error(f"Error scanning directory {path}: {e}")
-        
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry)
+                            continue
+                    except OSError:
+                        continue
+                    name = entry.name
+                    # Lowercase only the suffix, not the whole name
+                    _, dot, ext = name.rpartition('.')
+                    if not dot or ext.lower() not in _VIDEO_EXT_SET:
+                        continue
+                    full_path = entry.path
+                    try:
+                        stats = entry.stat()
+                        size = stats.st_size
+                        modified = datetime.fromtimestamp(stats.st_mtime).isoformat()
+                    except OSError:
+                        size, modified = 0, None
+                    results.append({
+                        "name": name,
+                        "path": full_path,
+                        "relative_path": full_path[prefix_len:],
+                        "size": size,
+                        "modified": modified
+                    })
+        except OSError as e:
+            if directory == path:
+                logger.error(f"Error scanning directory {path}: {e}")
+            continue
+
+        # Reverse inode order so the stack pops the lowest inode first
+        subdirs.sort(key=lambda d: d.inode(), reverse=True)
+        pending.extend(d.path for d in subdirs)
+
     return results
 
 
+# Directory walks run here so a large mount never holds a request thread
+_scan_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="scan")
+
+
+def _set_scan_job(scan_id, path, status, file_count=None, error=None):
+    """Insert or update the scan_jobs row for ``scan_id``.
+
+    Starting a scan also prunes expired rows.
+    """
+    now = datetime.now().isoformat()
+    with _db_pool.transaction() as conn:
+        if status == "running":
+            _prune_scan_jobs(conn)
+        conn.execute(
+            """
+            INSERT INTO scan_jobs (id, path, status, started_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                status = excluded.status, file_count = ?, error = ?, completed_at = ?
+            """,
+            (scan_id, path, status, now, file_count, error, now),
+        )
+
+
+def get_scan_job(scan_id):
+    """Return the scan_jobs row for ``scan_id`` as a dict, or None"""
+    with _db_pool.connection() as conn:
+        row = conn.execute(
+            "SELECT id, path, status, file_count, error, started_at, completed_at"
+            " FROM scan_jobs WHERE id = ?",
+            (scan_id,),
+        ).fetchone()
+    return dict(row) if row else None
+
+
+def run_scan(scan_id, path):
+    """Scan ``path``, cache the results and announce completion to clients"""
+    try:
+        logger.info(f"🔍 Starting scan of: {path}")
+        scan_results = scan_directory_recursive(path)
+        save_scan_to_db(path, scan_results)
+        file_count = len(scan_results)
+        _set_scan_job(scan_id, path, "completed", file_count=file_count)
+        logger.info(f"✅ Scan complete for {path}: found {file_count} files")
+        socketio.emit(
+            "scan_complete",
+            {"scan_id": scan_id, "path": path, "file_count": file_count},
+            to=BROADCAST_ROOM,
+        )
+    except Exception as e:
+        logger.error(f"Error scanning {path}: {e}")
+        try:
+            _set_scan_job(scan_id, path, "failed", error=str(e))
+        except Exception as db_error:
+            # The row stays running until the next restart marks it failed
+            logger.error(f"Error recording failed scan {scan_id}: {db_error}")
+        socketio.emit(
+            "scan_complete",
+            {"scan_id": scan_id, "path": path, "error": str(e)},
+            to=BROADCAST_ROOM,
+        )
+
+
 @app.route("/api/filesystem/scan", methods=["POST"])
 @require_auth
 def trigger_scan():
-    """Trigger a filesystem scan for a path"""
+    """Start a background filesystem scan for a path.
+
+    Returns 202 with a ``scan_id``; poll /api/filesystem/scan/<scan_id> or
+    listen for the ``scan_complete`` Socket.IO event.
+    """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         path = data.get("path")
         
         if not path:
@@ -261,27 +562,34 @@ def trigger_scan():
             
         if not os.path.exists(path):
             return jsonify({"success": False, "error": "Path does not exist"}), 404
-            
-        # Perform scan in a background thread if it's likely to be slow?
-        # For now, let's do it synchronously but we might want to change this
-        logger.info(f"🔍 Starting scan of: {path}")
-        scan_results = scan_directory_recursive(path)
-        save_scan_to_db(path, scan_results)
-        logger.info(f"✅ Scan complete for {path}: found {len(scan_results)} files")
-        
+
+        scan_id = str(uuid.uuid4())
+        _set_scan_job(scan_id, path, "running")
+        _scan_executor.submit(run_scan, scan_id, path)
+
         return jsonify({
-            "success": True, 
-            "data": {
-                "path": path,
-                "file_count": len(scan_results),
-                "files": scan_results[:100] # Return first 100 files
-            }
-        })
+            "success": True,
+            "data": {"scan_id": scan_id, "path": path, "status": "running"}
+        }), 202
     except Exception as e:
         logger.error(f"Error triggering scan: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route("/api/filesystem/scan/<scan_id>", methods=["GET"])
+@require_auth
+def get_scan_status(scan_id):
+    """Get the status of a background scan"""
+    try:
+        scan_job = get_scan_job(scan_id)
+        if not scan_job:
+            return jsonify({"success": False, "error": "Scan not found"}), 404
+        return jsonify({"success": True, "data": scan_job})
+    except Exception as e:
+        logger.error(f"Error getting scan status: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route("/api/filesystem/cache", methods=["GET"])
 @require_auth
 def get_scan_cache():
@@ -293,15 +601,17 @@ def get_scan_cache():
             
         cached = get_cached_scan(path)
         if cached:
-            return jsonify({
-                "success": True, 
-                "data": {
-                    "path": path,
-                    "last_scanned": cached["last_scanned"],
-                    "file_count": len(cached["content"]),
-                    "files": cached["content"][:100]
-                }
+            # Splice the page JSON from SQLite straight into the body
+            head = dumps_bytes({
+                "path": path,
+                "last_scanned": cached["last_scanned"],
+                "file_count": cached["file_count"],
             })
+            body = b"".join((
+                b'{"success":true,"data":', head[:-1],
+                b',"files":', cached["files_json"].encode("utf-8"), b"}}",
+            ))
+            return app.response_class(body, mimetype="application/json")
         else:
             return jsonify({"success": False, "error": "No cache found for this path"}), 404
     except Exception as e:
@@ -309,163 +619,323 @@ def get_scan_cache():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+# Job SQL, kept as module constants so every call passes the identical text
+# and hits the connection's prepared-statement cache.
+_INSERT_JOB_SQL = """
+    INSERT OR REPLACE INTO jobs (
+        id, input_path, output_path, quality, resolution,
+        video_bitrate, audio_bitrate, status, progress,
+        error_message, retry_count, max_retries,
+        created_at, started_at, completed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SELECT_JOB_SQL = "SELECT * FROM jobs WHERE id = ?"
+_SELECT_ALL_JOBS_SQL = """
+    SELECT id, input_path, output_path, quality, resolution,
+           video_bitrate, audio_bitrate, status, progress,
+           error_message, retry_count, max_retries,
+           created_at, started_at, completed_at,
+           0 AS estimated_duration
+    FROM jobs ORDER BY created_at DESC
+"""
+_SELECT_JOBS_PAGE_SQL = _SELECT_ALL_JOBS_SQL + "    LIMIT ? OFFSET ?\n"
+_COUNT_JOBS_BY_STATUS_SQL = "SELECT status, COUNT(*) FROM jobs GROUP BY status"
+
+
+def _job_row(job):
+    """Flatten a ConversionJob into the jobs table column order"""
+    return (
+        job.id,
+        job.input_path,
+        job.output_path,
+        job.quality,
+        job.resolution,
+        job.video_bitrate,
+        job.audio_bitrate,
+        job.status.value,
+        job.progress,
+        job.error_message,
+        job.retry_count,
+        job.max_retries,
+        job.created_at.isoformat() if job.created_at else None,
+        job.started_at.isoformat() if job.started_at else None,
+        job.completed_at.isoformat() if job.completed_at else None,
+    )
+
+
+def save_jobs_to_db(jobs):
+    """Save several jobs to SQLite in one transaction"""
+    with _db_pool.transaction(immediate=True) as conn:
+        conn.executemany(_INSERT_JOB_SQL, [_job_row(job) for job in jobs])
+    _jobs_dirty.set()
+
+
 def save_job_to_db(job):
     """Save job to SQLite database"""
-    db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
-
-    with get_db_connection(db_path) as conn:
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO jobs (
-                id, input_path, output_path, quality, resolution,
-                video_bitrate, audio_bitrate, status, progress,
-                error_message, retry_count, max_retries,
-                created_at, started_at, completed_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                job.id,
-                job.input_path,
-                job.output_path,
-                job.quality,
-                job.resolution,
-                job.video_bitrate,
-                job.audio_bitrate,
-                job.status.value,
-                job.progress,
-                job.error_message,
-                job.retry_count,
-                job.max_retries,
-                job.created_at.isoformat() if job.created_at else None,
-                job.started_at.isoformat() if job.started_at else None,
-                job.completed_at.isoformat() if job.completed_at else None,
-            ),
-        )
-        conn.commit()
+    save_jobs_to_db((job,))
 
 
 def get_job_from_db(job_id):
     """Get job from SQLite database"""
-    db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
-
-    with get_db_connection(db_path) as conn:
-        cursor = conn.execute(
-            """
-            SELECT * FROM jobs WHERE id = ?
-            """,
-            (job_id,),
-        )
+    with _db_pool.connection() as conn:
+        cursor = conn.execute(_SELECT_JOB_SQL, (job_id,))
         row = cursor.fetchone()
+        return ConversionJob.from_row(row) if row else None
+
+
+# Last jobs listing, reused until the database changes. PRAGMA data_version on
+# a connection that never writes changes whenever any other connection commits,
+# including the HandBrake service writing progress into the shared file.
+_jobs_snapshot = {
+    "version": None, "jobs": None, "body": None, "counts_version": None, "counts": None,
+}
+_jobs_snapshot_lock = threading.Lock()
+_jobs_watch_conn = None
 
-        if row:
-            # Convert row to ConversionJob object
-            job = ConversionJob(
-                id=row[0],
-                input_path=row[1],
-                output_path=row[2],
-                quality=row[3],
-                resolution=row[4],
-                video_bitrate=row[5],
-                audio_bitrate=row[6],
-                status=JobStatus(row[7]),
-                progress=row[8],
-                error_message=row[9],
-                retry_count=row[10],
-                max_retries=row[11],
-            )
-            return job
-        return None
+
+def _jobs_data_version():
+    """Return the database change counter (call with _jobs_snapshot_lock held)."""
+    global _jobs_watch_conn
+    if _jobs_watch_conn is None:
+        _jobs_watch_conn = get_db_connection(DB_PATH)
+    return _jobs_watch_conn.execute("PRAGMA data_version").fetchone()[0]
 
 
 def get_all_jobs_from_db():
-    """Get all jobs from SQLite database"""
-    db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
+    """Get all jobs from SQLite database (cached until the database changes)"""
+    with _jobs_snapshot_lock:
+        version = _jobs_data_version()
+        if version == _jobs_snapshot["version"]:
+            return _jobs_snapshot["jobs"]
 
-    with get_db_connection(db_path) as conn:
-        cursor = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC")
-        rows = cursor.fetchall()
+    with _db_pool.connection() as conn:
+        cursor = conn.execute(_SELECT_ALL_JOBS_SQL)
+        # Rows already carry the to_dict() shape; no ConversionJob round trip
+        jobs = [dict(row) for row in cursor]
 
-        jobs = []
-        for row in rows:
-            job = ConversionJob(
-                id=row[0],
-                input_path=row[1],
-                output_path=row[2],
-                quality=row[3],
-                resolution=row[4],
-                video_bitrate=row[5],
-                audio_bitrate=row[6],
-                status=JobStatus(row[7]),
-                progress=row[8],
-                error_message=row[9],
-                retry_count=row[10],
-                max_retries=row[11],
-            )
-            jobs.append(job.to_dict())
+    with _jobs_snapshot_lock:
+        _jobs_snapshot["version"] = version
+        _jobs_snapshot["jobs"] = jobs
+        _jobs_snapshot["body"] = None
+    return jobs
+
+
+def get_jobs_page_from_db(limit, offset):
+    """Return (page, total) for one page of jobs, newest first
+
+    Slices the jobs snapshot when it is current; otherwise only the page
+    is read, with LIMIT/OFFSET in SQL.
+    """
+    with _jobs_snapshot_lock:
+        version = _jobs_data_version()
+        if version == _jobs_snapshot["version"]:
+            jobs = _jobs_snapshot["jobs"]
+            return jobs[offset : offset + limit], len(jobs)
+
+    with _db_pool.connection() as conn:
+        cursor = conn.execute(_SELECT_JOBS_PAGE_SQL, (limit, offset))
+        page = [dict(row) for row in cursor]
+    return page, sum(get_job_counts_from_db().values())
 
-        return jobs
+
+def get_jobs_list_body():
+    """Return the /api/jobs/list JSON body, serialized once per jobs snapshot"""
+    jobs = get_all_jobs_from_db()
+    with _jobs_snapshot_lock:
+        if _jobs_snapshot["jobs"] is jobs and _jobs_snapshot["body"] is not None:
+            return _jobs_snapshot["body"]
+
+    body = dumps_bytes({"jobs": jobs, "count": len(jobs)})
+    with _jobs_snapshot_lock:
+        if _jobs_snapshot["jobs"] is jobs:
+            _jobs_snapshot["body"] = body
+    return body
+
+
+# Short-lived cache for the HandBrake /health probe so bursts of dashboard
+# polling and the realtime loop collapse into a single upstream request.
+HANDBRAKE_STATUS_TTL = 2.0
+# (connect, read) seconds for the probe; a stalled service must not hold up
+# the realtime loop or /health
+HANDBRAKE_HEALTH_TIMEOUT = (1, 2)
+_hb_status_cache = {"checked_at": 0.0, "value": None, "etag": None}
+_hb_status_lock = threading.Lock()
+# Held while probing, so concurrent callers on an expired cache wait for the
+# one in-flight request instead of each sending their own
+_hb_status_fetch_lock = threading.Lock()
+
+
+def get_job_counts_from_db():
+    """Return a Counter of job status -> count (cached until the database changes)
+
+    Counted from the jobs snapshot when that is current, otherwise with one
+    aggregate query. The returned Counter is shared; do not modify it.
+    """
+    with _jobs_snapshot_lock:
+        version = _jobs_data_version()
+        if version == _jobs_snapshot["counts_version"]:
+            return _jobs_snapshot["counts"]
+        if version == _jobs_snapshot["version"]:
+            counts = Counter(job["status"] for job in _jobs_snapshot["jobs"])
+            _jobs_snapshot["counts_version"] = version
+            _jobs_snapshot["counts"] = counts
+            return counts
+
+    with _db_pool.connection() as conn:
+        cursor = conn.execute(_COUNT_JOBS_BY_STATUS_SQL)
+        counts = Counter(dict(cursor.fetchall()))
+
+    with _jobs_snapshot_lock:
+        _jobs_snapshot["counts_version"] = version
+        _jobs_snapshot["counts"] = counts
+    return counts
 
 
 def get_handbrake_service_status():
-    """Check HandBrake service status"""
-    try:
-        response = requests.get(f"{HANDBRAKE_SERVICE_URL}/health", timeout=5)
-        if response.status_code == 200:
-            return response.json()
-        return None
-    except Exception as e:
-        logger.error(f"HandBrake service check failed: {e}")
-        return None
+    """Check HandBrake service status (cached for HANDBRAKE_STATUS_TTL seconds)"""
+    with _hb_status_lock:
+        if time.monotonic() - _hb_status_cache["checked_at"] < HANDBRAKE_STATUS_TTL:
+            return _hb_status_cache["value"]
+
+    with _hb_status_fetch_lock:
+        now = time.monotonic()
+        with _hb_status_lock:
+            # Another caller may have refreshed it while we waited
+            if now - _hb_status_cache["checked_at"] < HANDBRAKE_STATUS_TTL:
+                return _hb_status_cache["value"]
+            etag = _hb_status_cache["etag"]
+            previous = _hb_status_cache["value"]
+
+        # Revalidate against the last snapshot; a 304 means it is still current
+        headers = {"If-None-Match": etag} if etag and previous is not None else None
+        try:
+            response = _hb_session.get(
+                f"{HANDBRAKE_SERVICE_URL}/health",
+                timeout=HANDBRAKE_HEALTH_TIMEOUT,
+                headers=headers,
+            )
+            if response.status_code == 304:
+                value = previous
+            elif response.status_code == 200:
+                value = response.json()
+                etag = response.headers.get("ETag")
+            else:
+                value = None
+        except Exception as e:
+            logger.error(f"HandBrake service check failed: {e}")
+            value = None
+
+        with _hb_status_lock:
+            _hb_status_cache["checked_at"] = now
+            _hb_status_cache["value"] = value
+            _hb_status_cache["etag"] = etag if value is not None else None
+        return value
+
+
+# 503 body shared by every handler that needs the HandBrake service, encoded once.
+# A fresh Response wraps it per request because after_request hooks (CORS)
+# mutate response headers.
+_HB_UNAVAILABLE_BODY = dumps_bytes(
+    {
+        "error": "HandBrake service unavailable",
+        "message": "Video conversion service is not responding",
+    }
+)
+
+
+def _handbrake_unavailable():
+    """Return the standard 503 response for an unreachable HandBrake service."""
+    return app.response_class(
+        _HB_UNAVAILABLE_BODY, status=503, mimetype="application/json"
+    )
+
+
+def forward_to_handbrake_service(
+    endpoint, data=None, method="GET", parse_json=True, params=None
+):
+    """Forward request to HandBrake service.
 
+    Query arguments go in ``params`` so they are URL-encoded by the session
+    rather than formatted into ``endpoint`` by hand.
 
-def forward_to_handbrake_service(endpoint, data=None, method="GET"):
-    """Forward request to HandBrake service."""
+    Returns the decoded JSON body on HTTP 200, or None on failure. Callers that
+    only need to know the request was accepted pass ``parse_json=False`` to get
+    ``True`` back without decoding the body.
+    """
     try:
-        url = f"{HANDBRAKE_SERVICE_URL}{endpoint}"
-        if method == "GET":
-            response = requests.get(url, timeout=10)
-        elif method == "POST":
-            response = requests.post(url, json=data, timeout=10)
-        elif method == "DELETE":
-            response = requests.delete(url, timeout=10)
-        else:
+        if method not in ("GET", "POST", "DELETE"):
             return None
 
-        if response.status_code == 200:
-            return response.json()
-        return None
+        url = f"{HANDBRAKE_SERVICE_URL}{endpoint}"
+        response = _hb_session.request(
+            method,
+            url,
+            params=params,
+            json=data if method == "POST" else None,
+            timeout=(2, 30),
+        )
+
+        if response.status_code != 200:
+            return None
+        return response.json() if parse_json else True
     except Exception as e:
         logger.error(f"HandBrake service request failed: {e}")
         return None
 
 
-@app.route("/health")
-def health_check():
-    """Health check endpoint"""
+# Invariant /health fields, encoded once at import as an open JSON object.
+_HEALTH_HEAD = b'{"status":"healthy","service":"api-gateway","version":"2.0.0",'
+
+
+# Liveness probes arrive every few seconds per replica; serve them from the
+# last result instead of probing SQLite and HandBrake each time
+HEALTH_CACHE_TTL = 5.0
+_health_cache = {"checked_at": float("-inf"), "body": None}
+# Held while probing, so concurrent probes on an expired cache share one check
+_health_lock = threading.Lock()
+
+
+def _build_health_body():
+    """Probe the database and HandBrake and encode the /health body"""
+    # Check HandBrake service
+    handbrake_status = get_handbrake_service_status()
+
+    # Check database
     try:
-        # Check HandBrake service
-        handbrake_status = get_handbrake_service_status()
+        with _db_pool.connection() as conn:
+            conn.execute("SELECT 1")
+        db_status = "healthy"
+    except Exception as e:
+        db_status = f"error: {e}"
 
-        # Check database
-        db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
-        try:
-            with get_db_connection(db_path) as conn:
-                conn.execute("SELECT 1")
-            db_status = "healthy"
-        except Exception as e:
-            db_status = f"error: {e}"
+    # Static fields are pre-encoded; only the dynamic tail is serialized
+    tail = dumps_bytes(
+        {
+            "timestamp": iso_now(),
+            "database": db_status,
+            "handbrake_service": handbrake_status is not None,
+            "handbrake_status": handbrake_status,
+        }
+    )
+    return _HEALTH_HEAD + tail[1:]
 
-        return jsonify(
-            {
-                "status": "healthy",
-                "timestamp": datetime.utcnow().isoformat(),
-                "service": "api-gateway",
-                "version": "2.0.0",
-                "database": db_status,
-                "handbrake_service": handbrake_status is not None,
-                "handbrake_status": handbrake_status,
-            }
-        )
+
+@app.route("/health")
+def health_check():
+    """Health check endpoint
+
+    Returns the last check if it is under HEALTH_CACHE_TTL seconds old;
+    ``?deep=1`` always probes the database and HandBrake.
+    """
+    try:
+        deep = request.args.get("deep") == "1"
+        with _health_lock:
+            now = time.monotonic()
+            if deep or now - _health_cache["checked_at"] >= HEALTH_CACHE_TTL:
+                _health_cache["body"] = _build_health_body()
+                _health_cache["checked_at"] = now
+            body = _health_cache["body"]
+        return app.response_class(body, mimetype="application/json")
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return jsonify({"status": "unhealthy", "error": str(e)}), 500
@@ -475,9 +945,9 @@ def health_check():
 def login():
     """User login endpoint"""
     try:
-        data = request.get_json()
-        username = data.get("username")
-        password = data.get("password")
+        creds = parse_body(CredentialsRequest, request.get_json(silent=True))
+        username = creds.username
+        password = creds.password
 
         if not username or not password:
             return (
@@ -520,6 +990,8 @@ def login():
                 401,
             )
 
+    except SchemaError as e:
+        return jsonify({"error": "Invalid request", "message": str(e)}), 400
     except Exception as e:
         logger.error(f"Login error: {e}")
         return (
@@ -534,9 +1006,9 @@ def login():
 def register():
     """User registration endpoint"""
     try:
-        data = request.get_json()
-        username = data.get("username")
-        password = data.get("password")
+        creds = parse_body(CredentialsRequest, request.get_json(silent=True))
+        username = creds.username
+        password = creds.password
 
         if not username or not password:
             return (
@@ -565,6 +1037,8 @@ def register():
                 400,
             )
 
+    except SchemaError as e:
+        return jsonify({"error": "Invalid request", "message": str(e)}), 400
     except Exception as e:
         logger.error(f"Registration error: {e}")
         return (
@@ -596,18 +1070,10 @@ def verify_token():
 def add_job():
     """Add a new conversion job"""
     try:
-        data = request.get_json()
+        req = parse_body(AddJobRequest, request.get_json(silent=True))
 
         # Create job object
-        job = ConversionJob(
-            id=str(uuid.uuid4()),
-            input_path=data.get("input_path"),
-            output_path=data.get("output_path") or "",
-            quality=int(data.get("quality", 23)),
-            resolution=data.get("resolution", "1280x720"),
-            video_bitrate=data.get("video_bitrate", 1000),
-            audio_bitrate=data.get("audio_bitrate", 96),
-        )
+        job = _new_job(req)
 
         # Save to database
         save_job_to_db(job)
@@ -616,7 +1082,7 @@ def add_job():
         payload = job.to_dict()
         payload["job_id"] = job.id
         handbrake_response = forward_to_handbrake_service(
-            "/convert", payload, "POST"
+            "/convert", payload, "POST", parse_json=False
         )
 
         if handbrake_response:
@@ -629,16 +1095,10 @@ def add_job():
                 }
             )
         else:
-            return (
-                jsonify(
-                    {
-                        "error": "HandBrake service unavailable",
-                        "message": "Video conversion service is not responding",
-                    }
-                ),
-                503,
-            )
+            return _handbrake_unavailable()
 
+    except SchemaError as e:
+        return jsonify({"error": "Invalid request", "message": str(e)}), 400
     except Exception as e:
         logger.error(f"Add job error: {e}")
         return (
@@ -652,6 +1112,73 @@ def add_job():
         )
 
 
+def _new_job(req):
+    """Build a pending ConversionJob from a validated AddJobRequest"""
+    return ConversionJob(
+        id=str(uuid.uuid4()),
+        input_path=req.input_path,
+        output_path=req.output_path,
+        quality=req.quality,
+        resolution=req.resolution,
+        video_bitrate=req.video_bitrate,
+        audio_bitrate=req.audio_bitrate,
+    )
+
+
+@app.route("/api/jobs/add_bulk", methods=["POST"])
+def add_jobs_bulk():
+    """Add several conversion jobs; all rows are saved in one transaction.
+
+    Returns per-row ``{"job_id", "error"}`` results in input order.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list) or not data:
+            return jsonify({"error": "Expected a non-empty JSON array of jobs"}), 400
+
+        results = []
+        jobs = []
+        for item in data:
+            try:
+                job = _new_job(parse_body(AddJobRequest, item))
+            except SchemaError as e:
+                results.append({"job_id": None, "error": str(e)})
+                continue
+            jobs.append(job)
+            results.append({"job_id": job.id, "error": None})
+
+        if jobs:
+            save_jobs_to_db(jobs)
+
+        by_id = {r["job_id"]: r for r in results if r["job_id"]}
+        if jobs:
+            # One request for the whole batch; HandBrake answers per job
+            payload = [{**job.to_dict(), "job_id": job.id} for job in jobs]
+            forwarded = forward_to_handbrake_service("/convert/bulk", payload, "POST")
+            if forwarded is None:
+                for job in jobs:
+                    by_id[job.id]["error"] = "HandBrake service unavailable"
+            else:
+                for item in forwarded.get("results", []):
+                    if item.get("error") and item.get("job_id") in by_id:
+                        by_id[item["job_id"]]["error"] = item["error"]
+
+        logger.info(f"Bulk add: {len(jobs)}/{len(data)} jobs saved")
+        return jsonify({"results": results, "count": len(jobs)})
+
+    except Exception as e:
+        logger.error(f"Bulk add job error: {e}")
+        return (
+            jsonify(
+                {
+                    "error": "Add job failed",
+                    "message": "An error occurred while adding jobs",
+                }
+            ),
+            500,
+        )
+
+
 @app.route("/api/jobs/status/<job_id>")
 def get_job_status(job_id):
     """Get job status"""
@@ -660,7 +1187,7 @@ def get_job_status(job_id):
         job = get_job_from_db(job_id)
 
         if job:
-            return jsonify(job.to_dict())
+            return orjson_response(job.to_dict())
         else:
             return (
                 jsonify(
@@ -685,12 +1212,33 @@ def get_job_status(job_id):
         )
 
 
+# Upper bound for ?limit= on paginated job listings
+MAX_JOBS_PAGE_SIZE = 500
+
+
+def _page_args():
+    """Return (limit, offset) from the query string; limit is None when absent"""
+    limit = request.args.get("limit", type=int)
+    offset = max(0, request.args.get("offset", 0, type=int))
+    if limit is not None:
+        limit = min(max(1, limit), MAX_JOBS_PAGE_SIZE)
+    return limit, offset
+
+
 @app.route("/api/jobs/list")
 def list_jobs():
-    """List all jobs"""
+    """List all jobs, or one page of them with ?limit=&offset="""
     try:
-        jobs = get_all_jobs_from_db()
-        return jsonify({"jobs": jobs, "count": len(jobs)})
+        limit, offset = _page_args()
+        if limit is None:
+            return app.response_class(
+                get_jobs_list_body(), mimetype="application/json"
+            )
+
+        page, total = get_jobs_page_from_db(limit, offset)
+        return orjson_response(
+            {"jobs": page, "count": len(page), "total": total, "offset": offset}
+        )
 
     except Exception as e:
         logger.error(f"List jobs error: {e}")
@@ -705,34 +1253,47 @@ def list_jobs():
         )
 
 
+# Jobs in these states have nothing left to cancel on the HandBrake side.
+_FINISHED_JOB_STATUSES = frozenset(
+    (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED)
+)
+
+
+def _cancel_precheck(job):
+    """Answer a cancel locally when the job is unknown or already finished.
+
+    Returns a response tuple, or None if the cancel must go to HandBrake.
+    """
+    if job is None:
+        return jsonify({"error": "Job not found", "message": "Job does not exist"}), 404
+    if job.status in _FINISHED_JOB_STATUSES:
+        return jsonify({"message": "Job is not active", "status": job.status.value}), 200
+    return None
+
+
 @app.route("/api/jobs/cancel/<job_id>", methods=["POST"])
 def cancel_job(job_id):
     """Cancel a job"""
     try:
+        job = get_job_from_db(job_id)
+        local_response = _cancel_precheck(job)
+        if local_response:
+            return local_response
+
         # Forward to HandBrake service
         handbrake_response = forward_to_handbrake_service(
-            f"/cancel/{job_id}", method="POST"
+            f"/cancel/{quote(job_id, safe='')}", method="POST", parse_json=False
         )
 
         if handbrake_response:
             # Update job in database
-            job = get_job_from_db(job_id)
-            if job:
-                job.status = JobStatus.CANCELLED
-                save_job_to_db(job)
+            job.status = JobStatus.CANCELLED
+            save_job_to_db(job)
 
             logger.info(f"Job {job_id} cancelled successfully")
             return jsonify({"message": "Job cancelled successfully"})
         else:
-            return (
-                jsonify(
-                    {
-                        "error": "HandBrake service unavailable",
-                        "message": "Video conversion service is not responding",
-                    }
-                ),
-                503,
-            )
+            return _handbrake_unavailable()
 
     except Exception as e:
         logger.error(f"Cancel job error: {e}")
@@ -755,26 +1316,21 @@ def delete_job(job_id: str):
     Handles both running and pending jobs.
     """
     try:
+        job = get_job_from_db(job_id)
+        local_response = _cancel_precheck(job)
+        if local_response:
+            return local_response
+
         handbrake_response = forward_to_handbrake_service(
-            f"/jobs/{job_id}", method="DELETE"
+            f"/jobs/{quote(job_id, safe='')}", method="DELETE", parse_json=False
         )
         if handbrake_response:
-            job = get_job_from_db(job_id)
-            if job:
-                job.status = JobStatus.CANCELLED
-                save_job_to_db(job)
+            job.status = JobStatus.CANCELLED
+            save_job_to_db(job)
             logger.info(f"Job {job_id} cancelled via DELETE")
             return jsonify({"message": "Job cancelled successfully"})
         else:
-            return (
-                jsonify(
-                    {
-                        "error": "HandBrake service unavailable",
-                        "message": "Video conversion service is not responding",
-                    }
-                ),
-                503,
-            )
+            return _handbrake_unavailable()
     except Exception as e:
         logger.error(f"Delete job error: {e}")
         return (
@@ -788,51 +1344,161 @@ def delete_job(job_id: str):
         )
 
 
+# Runs the HandBrake probe and the jobs query side by side so a realtime tick
+# costs max(upstream, db) instead of their sum.
+_tick_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="realtime")
+_NOT_FETCHED = object()
+
+
+def _fetch_status_and_jobs():
+    """Fetch HandBrake status and all jobs concurrently."""
+    hb_future = _tick_executor.submit(get_handbrake_service_status)
+    jobs_future = _tick_executor.submit(get_all_jobs_from_db)
+    return hb_future.result(), jobs_future.result()
+
+
+# Latest-only broadcast slots, one per event name. If the writer falls behind,
+# newer payloads overwrite older ones instead of piling up.
+_pending_broadcasts = {}
+_pending_broadcasts_cond = threading.Condition()
+
+
+def _queue_broadcast(event, payload):
+    """Schedule ``payload`` for broadcast, replacing any unsent one for ``event``."""
+    with _pending_broadcasts_cond:
+        _pending_broadcasts[event] = payload
+        _pending_broadcasts_cond.notify()
+
+
+# Digest of the last payload queued per event. Cleared when a client connects
+# so newcomers always receive a full update.
+_last_broadcast_digests = {}
+
+
+def _queue_broadcast_if_changed(event, payload, volatile=()):
+    """Queue ``payload`` unless it matches the last one queued for ``event``.
+
+    Top-level keys listed in ``volatile`` (such as the timestamp) are left out
+    of the comparison. Returns True when the payload was queued.
+    """
+    if volatile:
+        compared = {k: v for k, v in payload.items() if k not in volatile}
+    else:
+        compared = payload
+    digest = hashlib.blake2b(dumps_bytes(compared), digest_size=16).digest()
+    if _last_broadcast_digests.get(event) == digest:
+        return False
+    _last_broadcast_digests[event] = digest
+    _queue_broadcast(event, payload)
+    return True
+
+
+def _broadcast_writer():
+    """Drain the pending slots and emit each event's most recent payload."""
+    global _pending_broadcasts
+    while True:
+        with _pending_broadcasts_cond:
+            while not _pending_broadcasts:
+                _pending_broadcasts_cond.wait()
+            batch, _pending_broadcasts = _pending_broadcasts, {}
+        for event, payload in batch.items():
+            try:
+                # One packet encode, reused for every member of the room.
+                # Every worker runs this loop for its own clients, so skip
+                # SOCKETIO_MESSAGE_QUEUE; publishing would send N copies.
+                socketio.emit(event, payload, to=BROADCAST_ROOM, ignore_queue=True)
+            except Exception as e:
+                logger.error(f"Error broadcasting {event}: {e}")
+
+
 def start_realtime_updates():
-    """Start real-time updates thread"""
-    
+    """Start real-time updates thread.
+
+    Broadcasts when job state changes (``_jobs_dirty``) and at least every
+    REALTIME_HEARTBEAT_SECONDS as a heartbeat.
+    """
+    # Prime the non-blocking CPU sampler so the first tick reports a real value
+    psutil.cpu_percent(interval=None)
+
     def update_loop():
         while True:
+            if not _connected_clients:
+                # Nobody is listening: skip the probe, query and broadcast
+                socketio.sleep(1)
+                continue
             try:
                 # Use application context for database and jsonify
                 with app.app_context():
-                    # Get system status
-                    system_status = _get_system_status_dict()
-                    
-                    # Get job queue
-                    jobs = get_all_jobs_from_db()
-                    
-                    # Emit updates to all connected clients
-                    socketio.emit("system_update", system_status)
-                    socketio.emit("queue_update", {"jobs": jobs})
-                
-                time.sleep(5)  # Update every 5 seconds
+                    # One jobs query per tick; the job list rides along in the
+                    # status payload so each tick is one encode and one emit
+                    handbrake_status, jobs = _fetch_status_and_jobs()
+                    system_status = _get_system_status_dict(jobs, handbrake_status)
+                    system_status["queue"] = {"jobs": jobs}
+
+                    # Hand off to the broadcast writer (latest payload wins);
+                    # unchanged payloads are not re-sent
+                    _queue_broadcast_if_changed(
+                        "system_update", system_status, volatile=("timestamp",)
+                    )
+
+                # Wake early on job changes, otherwise on the heartbeat
+                _jobs_dirty.wait(timeout=REALTIME_HEARTBEAT_SECONDS)
+                _jobs_dirty.clear()
             except Exception as e:
                 logger.error(f"Error in update loop: {e}")
-                time.sleep(10)  # Wait longer on error
-    
-    # Start update thread
-    update_thread = threading.Thread(target=update_loop, daemon=True)
-    update_thread.start()
+                socketio.sleep(10)  # Wait longer on error
+
+    # Run both loops on the server's async model (threads or green threads)
+    socketio.start_background_task(_broadcast_writer)
+    socketio.start_background_task(_client_log_writer)
+    socketio.start_background_task(update_loop)
+
+
+# Concurrent status requests, socket updates and the realtime loop share
+# one /proc read per SYSTEM_USAGE_TTL seconds
+SYSTEM_USAGE_TTL = 2.0
+_usage_cache = {"checked_at": float("-inf"), "value": None}
+_usage_lock = threading.Lock()
+
+
+def _get_resource_usage():
+    """Return (cpu_percent, virtual_memory, disk_usage) cached for SYSTEM_USAGE_TTL seconds"""
+    with _usage_lock:
+        now = time.monotonic()
+        if now - _usage_cache["checked_at"] >= SYSTEM_USAGE_TTL:
+            _usage_cache["value"] = (
+                psutil.cpu_percent(interval=None),
+                psutil.virtual_memory(),
+                psutil.disk_usage("/"),
+            )
+            _usage_cache["checked_at"] = now
+        return _usage_cache["value"]
 
 
-def _get_system_status_dict():
-    """Internal helper to get system status as a dictionary"""
+def _get_system_status_dict(jobs=None, handbrake_status=_NOT_FETCHED):
+    """Internal helper to get system status as a dictionary.
+
+    Pass ``jobs`` / ``handbrake_status`` when the caller already fetched them
+    to avoid repeating the query or the upstream probe.
+    """
     # Get HandBrake service status
-    handbrake_status = get_handbrake_service_status()
+    if handbrake_status is _NOT_FETCHED:
+        handbrake_status = get_handbrake_service_status()
 
     # Get system resources
-    import psutil
-
-    cpu_percent = psutil.cpu_percent(interval=None)
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage("/")
-
-    # Get job statistics
-    jobs = get_all_jobs_from_db()
-    active_jobs = len([j for j in jobs if j["status"] in ["running", "pending"]])
-    completed_jobs = len([j for j in jobs if j["status"] == "completed"])
-    failed_jobs = len([j for j in jobs if j["status"] == "failed"])
+    cpu_percent, memory, disk = _get_resource_usage()
+
+    # Get job statistics: count the rows we already have, else aggregate in SQL
+    if jobs is None:
+        counts = get_job_counts_from_db()
+    else:
+        counts = Counter(j["status"] for j in jobs)
+    total_jobs = sum(counts.values())
+    running_jobs = counts["running"]
+    pending_jobs = counts["pending"]
+    active_jobs = running_jobs + pending_jobs
+    completed_jobs = counts["completed"]
+    failed_jobs = counts["failed"]
 
     return {
         "service": "api-gateway",
@@ -856,36 +1522,58 @@ def _get_system_status_dict():
             "disk_free_gb": disk.free / (1024**3),
         },
         "active": active_jobs,
-        "running": len([j for j in jobs if j["status"] == "running"]),
-        "pending": len([j for j in jobs if j["status"] == "pending"]),
+        "running": running_jobs,
+        "pending": pending_jobs,
         "completed": completed_jobs,
         "failed": failed_jobs,
-        "total": len(jobs),
+        "total": total_jobs,
         "jobs": {
             "active": active_jobs,
-            "running": len([j for j in jobs if j["status"] == "running"]),
-            "pending": len([j for j in jobs if j["status"] == "pending"]),
+            "running": running_jobs,
+            "pending": pending_jobs,
             "completed": completed_jobs,
             "failed": failed_jobs,
-            "total": len(jobs),
+            "total": total_jobs,
         },
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": iso_now(),
         "version": "2.0.0",
     }
 
 
+# Last system status, reused while the jobs table is unchanged
+# and the resource reading it carries is still current
+_system_status_cache = {"checked_at": float("-inf"), "version": None, "value": None}
+_system_status_lock = threading.Lock()
+
+
+def _get_cached_system_status():
+    """Return _get_system_status_dict(), cached for SYSTEM_USAGE_TTL seconds"""
+    with _system_status_lock:
+        with _jobs_snapshot_lock:
+            version = _jobs_data_version()
+        now = time.monotonic()
+        if (
+            version != _system_status_cache["version"]
+            or now - _system_status_cache["checked_at"] >= SYSTEM_USAGE_TTL
+        ):
+            _system_status_cache["value"] = _get_system_status_dict()
+            _system_status_cache["version"] = version
+            _system_status_cache["checked_at"] = now
+        return _system_status_cache["value"]
+
+
 @app.route("/api/system/status")
 @app.route("/api/system/load")
 def get_system_status():
     """Get comprehensive system status"""
     try:
-        status = _get_system_status_dict()
+        status = _get_cached_system_status()
 
         # Handle different response formats expected by frontend
         if request.path == "/api/system/load":
-            return jsonify({"success": True, "data": status})
+            return orjson_response({"success": True, "data": status})
         
-        return jsonify(status)
+        return orjson_response(status)
     except Exception as e:
         logger.error(f"Error getting system status: {e}")
         return jsonify({"error": str(e)}), 500
@@ -895,16 +1583,17 @@ def get_system_status():
 def get_queue_info():
     """Get queue status (alias for system status jobs)"""
     try:
-        jobs = get_all_jobs_from_db()
-        return jsonify({
-            "success": True, 
+        # One GROUP BY query instead of loading every job to count them
+        counts = get_job_counts_from_db()
+        return orjson_response({
+            "success": True,
             "data": {
-                "active": len([j for j in jobs if j["status"] in ["running", "pending"]]),
-                "running": len([j for j in jobs if j["status"] == "running"]),
-                "pending": len([j for j in jobs if j["status"] == "pending"]),
-                "completed": len([j for j in jobs if j["status"] == "completed"]),
-                "failed": len([j for j in jobs if j["status"] == "failed"]),
-                "total": len(jobs),
+                "active": counts["running"] + counts["pending"],
+                "running": counts["running"],
+                "pending": counts["pending"],
+                "completed": counts["completed"],
+                "failed": counts["failed"],
+                "total": sum(counts.values()),
                 "paused": False
             }
         })
@@ -914,10 +1603,16 @@ def get_queue_info():
 
 @app.route("/api/queue/jobs", methods=["GET"])
 def get_queue_jobs():
-    """Get all jobs in the queue"""
+    """Get all jobs in the queue, or one page of them with ?limit=&offset="""
     try:
+        limit, offset = _page_args()
+        if limit is not None:
+            page, total = get_jobs_page_from_db(limit, offset)
+            return orjson_response(
+                {"success": True, "data": page, "total": total, "offset": offset}
+            )
         jobs = get_all_jobs_from_db()
-        return jsonify({"success": True, "data": jobs})
+        return orjson_response({"success": True, "data": jobs})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)}), 500
 
@@ -932,17 +1627,25 @@ def filesystem_roots():
             "input": {
                 "label": "Input Media",
                 "path": "/media/input",
-                "host_path": os.environ.get("MEDIA_INPUT_PATH", "/media/input"),
+                "host_path": MEDIA_INPUT_HOST_PATH,
             },
             "output": {
                 "label": "Output",
                 "path": "/media/output",
-                "host_path": os.environ.get("MEDIA_OUTPUT_PATH", "/media/output"),
+                "host_path": MEDIA_OUTPUT_HOST_PATH,
             }
         }
     })
 
 
+# Encoded browse responses by path, valid while the directory's mtime and
+# inode are unchanged (entries added, removed or renamed bump the mtime).
+# Sizes of files that grow in place can lag until the next such change.
+BROWSE_CACHE_SIZE = 512
+_browse_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_browse_cache_lock = threading.Lock()
+
+
 @app.route("/api/filesystem/browse", methods=["GET"])
 @require_auth
 def browse_filesystem():
@@ -958,68 +1661,91 @@ def browse_filesystem():
         path = os.path.abspath(path)
         
         # Log what we are trying to browse
-        logger.info(f"📂 Browsing filesystem at: {path}")
+        logger.debug(f"📂 Browsing filesystem at: {path}")
 
-        if not os.path.exists(path):
+        # One stat decides whether the cached listing is still current
+        try:
+            dir_stat = os.stat(path)
+        except FileNotFoundError:
             logger.warning(f"❌ Path does not exist: {path}")
             return jsonify({"success": False, "error": "Path does not exist", "path": path}), 404
-            
-        if not os.path.isdir(path):
+        except PermissionError:
+            logger.error(f"❌ Permission denied: {path}")
+            return jsonify({"success": False, "error": "Permission denied", "path": path}), 403
+        if not stat.S_ISDIR(dir_stat.st_mode):
+            logger.warning(f"❌ Path is not a directory: {path}")
+            return jsonify({"success": False, "error": "Path is not a directory", "path": path}), 400
+
+        cache_key = (dir_stat.st_mtime_ns, dir_stat.st_ino)
+        with _browse_cache_lock:
+            cached = _browse_cache.get(path)
+            if cached and cached[0] == cache_key:
+                _browse_cache.move_to_end(path)
+                return app.response_class(cached[1], mimetype="application/json")
+
+        # (is_file, lowercase name, name, item): sorts directories first, then
+        # case-insensitively; the exact name breaks ties so items never compare
+        decorated = []
+
+        # One scandir pass: entry types come from the directory read, and only
+        # files are stat()ed for size/mtime. The path can still vanish or
+        # change between the stat above and this read.
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        # Follows symlinks so linked media folders stay browsable
+                        is_directory = entry.is_dir()
+                    except OSError:
+                        is_directory = False
+                    size, modified = 0, None
+                    if not is_directory:
+                        try:
+                            stats = entry.stat()
+                            size = stats.st_size
+                            modified = datetime.fromtimestamp(stats.st_mtime).isoformat()
+                        except OSError as entry_e:
+                            # Still list the entry with minimal info
+                            logger.warning(f"Failed to stat entry {entry.name}: {entry_e}")
+                    name = entry.name
+                    decorated.append((not is_directory, name.lower(), name, {
+                        "name": name,
+                        "path": entry.path,
+                        "is_directory": is_directory,
+                        "size": size,
+                        "modified": modified
+                    }))
+        except FileNotFoundError:
+            logger.warning(f"❌ Path does not exist: {path}")
+            return jsonify({"success": False, "error": "Path does not exist", "path": path}), 404
+        except NotADirectoryError:
             logger.warning(f"❌ Path is not a directory: {path}")
             return jsonify({"success": False, "error": "Path is not a directory", "path": path}), 400
+        except PermissionError:
+            logger.error(f"❌ Permission denied: {path}")
+            return jsonify({"success": False, "error": "Permission denied", "path": path}), 403
             
+        # Sort: ".." first, then directories, then files (alphabetically).
+        # The keys were built during the scan, so this is plain tuple compares.
+        decorated.sort()
         items = []
-        
-        # Add ".." entry if not at root
         if path != "/":
-            parent_path = os.path.dirname(path)
             items.append({
                 "name": "..",
-                "path": parent_path,
+                "path": os.path.dirname(path),
                 "is_directory": True,
                 "size": 0,
                 "modified": None
             })
-
-        try:
-            for entry in os.scandir(path):
-                try:
-                    stats = entry.stat()
-                    items.append({
-                        "name": entry.name,
-                        "path": os.path.join(path, entry.name),
-                        "is_directory": entry.is_dir(),
-                        "size": stats.st_size,
-                        "modified": datetime.fromtimestamp(stats.st_mtime).isoformat()
-                    })
-                except Exception as entry_e:
-                    logger.warning(f"Failed to stat entry {entry.name}: {entry_e}")
-                    # Still add the entry with minimal info if we can't stat it
-                    items.append({
-                        "name": entry.name,
-                        "path": os.path.join(path, entry.name),
-                        "is_directory": entry.is_dir(),
-                        "size": 0,
-                        "modified": None
-                    })
-        except PermissionError:
-            logger.error(f"❌ Permission denied: {path}")
-            return jsonify({"success": False, "error": "Permission denied", "path": path}), 403
-            
-        # Sort: ".." first, then directories, then files (alphabetically)
-        items.sort(key=lambda x: (
-            x["name"] != "..", 
-            not x["is_directory"], 
-            x["name"].lower()
-        ))
+        items.extend(d[3] for d in decorated)
         
-        logger.info(f"✅ Found {len(items)} items in {path}")
+        logger.debug(f"✅ Found {len(items)} items in {path}")
         # Log first few items to help debug missing folders
-        if len(items) > 0:
+        if items:
             item_names = [i["name"] for i in items[:10]]
-            logger.info(f"📋 First items: {', '.join(item_names)}")
+            logger.debug(f"📋 First items: {', '.join(item_names)}")
         
-        return jsonify({
+        body = dumps_bytes({
             "success": True,
             "data": {
                 "current_path": path,
@@ -1027,6 +1753,12 @@ def browse_filesystem():
                 "items": items
             }
         })
+        with _browse_cache_lock:
+            _browse_cache[path] = (cache_key, body)
+            _browse_cache.move_to_end(path)
+            if len(_browse_cache) > BROWSE_CACHE_SIZE:
+                _browse_cache.popitem(last=False)
+        return app.response_class(body, mimetype="application/json")
     except Exception as e:
         logger.error(f"Error browsing filesystem: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1037,7 +1769,7 @@ def browse_filesystem():
 def create_directory():
     """Create a new directory"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True) or {}
         path = data.get("path")
         name = data.get("name")
         
@@ -1061,15 +1793,58 @@ def create_directory():
 
 
 # Add tabs endpoints for frontend compatibility
+# Serialized GET /api/tabs bodies per user, tagged with the PRAGMA data_version
+# they were built from. The counter moves whenever any connection (another
+# gateway worker included) commits to the auth database, so stale entries rebuild.
+_tabs_cache = {}
+_tabs_cache_lock = threading.Lock()
+_tabs_watch_conn = None
+
+
+def _tabs_data_version():
+    """Return the auth database change counter (call with _tabs_cache_lock held)."""
+    global _tabs_watch_conn
+    if _tabs_watch_conn is None:
+        _tabs_watch_conn = get_db_connection(auth_service.db_path)
+    return _tabs_watch_conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def _notify_tabs_changed(user_id=None):
+    """Tell ``user_id``'s connected clients (their room only) to refetch tabs.
+
+    Cached listings need no invalidation; the mutation's commit already
+    moved the data_version they are keyed on.
+    """
+    if user_id is None:
+        return
+    with _tabs_cache_lock:
+        version = _tabs_data_version()
+    socketio.emit("tabs_changed", {"version": version}, to=_user_room(user_id))
+
+
 @app.route("/api/tabs", methods=["GET"])
 @require_auth
 def get_tabs():
-    """Get all tabs from database"""
+    """Get all tabs from database (ETag / If-None-Match aware)"""
     try:
         user_id = getattr(request, 'user', {}).get('id')
-        logger.info(f"📋 GET /api/tabs requested by user {user_id}")
-        tabs = auth_service.get_tabs(user_id=user_id)
-        return jsonify({"success": True, "data": tabs})
+        logger.debug(f"📋 GET /api/tabs requested by user {user_id}")
+
+        with _tabs_cache_lock:
+            version = _tabs_data_version()
+            cached = _tabs_cache.get(user_id)
+        if cached is None or cached[0] != version:
+            tabs = auth_service.get_tabs(user_id=user_id)
+            body = dumps_bytes({"success": True, "data": tabs})
+            etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+            cached = (version, etag, body)
+            with _tabs_cache_lock:
+                _tabs_cache[user_id] = cached
+
+        _, etag, body = cached
+        response = app.response_class(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         logger.error(f"Error getting tabs: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
@@ -1080,42 +1855,85 @@ def get_tabs():
 def create_tab():
     """Create a new tab in database"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
             return jsonify({"error": "No data provided"}), 400
+        req = parse_body(CreateTabRequest, data)
 
         user_id = getattr(request, 'user', {}).get('id')
-        logger.info(f"🆕 POST /api/tabs - Creating tab for user {user_id}: {data.get('name')}")
+        logger.info(f"🆕 POST /api/tabs - Creating tab for user {user_id}: {req.name}")
         
         tab_id = auth_service.create_tab(
-            name=data.get("name", "New Tab"),
-            source_path=data.get("source_path", ""),
-            destination_path=data.get("destination_path", ""),
-            source_type=data.get("source_type", "tv"),
-            profile=data.get("profile", "standard"),
+            name=req.name,
+            source_path=req.source_path,
+            destination_path=req.destination_path,
+            source_type=req.source_type,
+            profile=req.profile,
             user_id=user_id
         )
 
         if tab_id:
-            # Fetch the newly created tab to return it, using the user_id for safety
-            tabs = auth_service.get_tabs(user_id=user_id)
-            new_tab = next((t for t in tabs if t['id'] == tab_id), None)
-            
+            _notify_tabs_changed(user_id)
+            # Fetch just the new row rather than every tab the user owns
+            new_tab = auth_service.get_tab(tab_id)
+
             if new_tab:
                 logger.info(f"✅ Tab created and retrieved: {new_tab['id']}")
-                return jsonify({"success": True, "data": new_tab})
+                return orjson_response({"success": True, "data": new_tab})
             else:
                 logger.warning(f"⚠️ Tab created with ID {tab_id} but not found in retrieval!")
-                return jsonify({"success": True, "data": {"id": tab_id, "name": data.get("name")}})
+                return orjson_response({"success": True, "data": {"id": tab_id, "name": req.name}})
         else:
             logger.error("❌ Failed to create tab - auth_service returned None")
             return jsonify({"success": False, "error": "Failed to create tab"}), 500
-            
+
+    except SchemaError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         logger.error(f"Error creating tab: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route("/api/tabs/bulk", methods=["POST"])
+@require_auth
+def bulk_create_tabs():
+    """Create several tabs in one request and one database transaction.
+
+    Returns per-row ``{"id", "error"}`` results in input order.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list) or not data:
+            return jsonify({"error": "Expected a non-empty JSON array of tabs"}), 400
+
+        user_id = getattr(request, 'user', {}).get('id')
+        results = []
+        valid_rows = []
+        for item in data:
+            try:
+                row = parse_body(CreateTabRequest, item)
+            except SchemaError as e:
+                results.append({"id": None, "error": str(e)})
+                continue
+            results.append({"id": None, "error": None})
+            valid_rows.append((len(results) - 1, asdict(row)))
+
+        if valid_rows:
+            tab_ids = auth_service.create_tabs_bulk(user_id, [row for _, row in valid_rows])
+            if tab_ids is None:
+                return jsonify({"success": False, "error": "Failed to create tabs"}), 500
+            for (index, _), tab_id in zip(valid_rows, tab_ids):
+                results[index]["id"] = tab_id
+            _notify_tabs_changed(user_id)
+
+        logger.info(f"🆕 POST /api/tabs/bulk - {len(valid_rows)}/{len(data)} tabs created for user {user_id}")
+        return orjson_response({"success": True, "data": results})
+
+    except Exception as e:
+        logger.error(f"Error bulk creating tabs: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @app.route("/api/tabs/<int:tab_id>", methods=["DELETE"])
 @require_auth
 def delete_tab(tab_id):
@@ -1123,6 +1941,7 @@ def delete_tab(tab_id):
     try:
         success = auth_service.delete_tab(tab_id)
         if success:
+            _notify_tabs_changed(request.user.get("id"))
             return jsonify({"success": True, "message": "Tab deleted successfully"})
         else:
             return jsonify({"success": False, "error": "Failed to delete tab or tab not found"}), 404
@@ -1136,12 +1955,13 @@ def delete_tab(tab_id):
 def update_tab(tab_id):
     """Update a tab in database"""
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True)
         if not data:
             return jsonify({"error": "No data provided"}), 400
 
         success = auth_service.update_tab(tab_id, data)
         if success:
+            _notify_tabs_changed(request.user.get("id"))
             return jsonify({"success": True, "message": "Tab updated successfully"})
         else:
             return jsonify({"success": False, "error": "Failed to update tab"}), 500
@@ -1162,38 +1982,78 @@ def get_tab_settings(tab_id):
             "quality": "high",
             "format": "mp4",
         }
-        return jsonify({"success": True, "data": settings})
+        return orjson_response({"success": True, "data": settings})
     except Exception as e:
         logger.error(f"Error getting tab settings: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+# Client-reported log records waiting to be written to client.log. Bounded so
+# an error storm from the browser cannot grow memory; the oldest are dropped.
+CLIENT_LOG_MAXLEN = 10_000
+CLIENT_LOG_BATCH = 256
+_client_log_queue = deque(maxlen=CLIENT_LOG_MAXLEN)
+_client_log_ready = threading.Event()
+
+
+def _record_client_log(record):
+    """Queue a client log record for the background writer"""
+    _client_log_queue.append(record)
+    _client_log_ready.set()
+
+
+def _drain_client_logs(stream):
+    """Write queued client records to ``stream`` as JSON lines, in batches"""
+    while _client_log_queue:
+        batch = []
+        while _client_log_queue and len(batch) < CLIENT_LOG_BATCH:
+            batch.append(dumps_bytes(_client_log_queue.popleft()) + b"\n")
+        stream.write(b"".join(batch))
+    stream.flush()
+
+
+def _client_log_writer():
+    """Append queued client records to <logs_directory>/client.log"""
+    path = os.path.join(config.storage.logs_directory, "client.log")
+    with open(path, "ab", buffering=64 * 1024) as stream:
+        while True:
+            _client_log_ready.wait()
+            _client_log_ready.clear()
+            try:
+                _drain_client_logs(stream)
+            except Exception as e:
+                logger.error(f"Error writing client logs: {e}")
+
+
 @app.route("/api/log-error", methods=["POST"])
 def log_client_error():
     """Log client-side JavaScript errors to server logs"""
     try:
-        error_data = request.get_json()
+        error_data = request.get_json(silent=True) or {}
         
         # Extract error information
         error_message = error_data.get('error', 'Unknown error')
         stack_trace = error_data.get('stack', 'No stack trace')
         component_stack = error_data.get('componentStack', 'No component stack')
-        timestamp = error_data.get('timestamp', datetime.utcnow().isoformat())
+        timestamp = error_data.get('timestamp') or iso_now()
         user_agent = error_data.get('userAgent', 'Unknown')
         url = error_data.get('url', 'Unknown')
         error_type = error_data.get('type', 'javascript_error')
         
-        # Log with structured logging
-        logger.error(
-            "CLIENT-SIDE ERROR",
-            error_message=error_message,
-            stack_trace=stack_trace,
-            component_stack=component_stack,
-            timestamp=timestamp,
-            user_agent=user_agent,
-            url=url,
-            error_type=error_type,
-            client_ip=request.remote_addr
+        # Hand off to the client log writer
+        _record_client_log(
+            {
+                "event": "CLIENT-SIDE ERROR",
+                "level": "error",
+                "error_message": error_message,
+                "stack_trace": stack_trace,
+                "component_stack": component_stack,
+                "timestamp": timestamp,
+                "user_agent": user_agent,
+                "url": url,
+                "error_type": error_type,
+                "client_ip": request.remote_addr,
+            }
         )
         
         return jsonify({"status": "logged", "message": "Error logged successfully"}), 200
@@ -1206,21 +2066,24 @@ def log_client_error():
 def log_client_info():
     """Log client-side info messages to server logs"""
     try:
-        info_data = request.get_json()
+        info_data = request.get_json(silent=True) or {}
         
         message = info_data.get('message', 'No message')
-        timestamp = info_data.get('timestamp', datetime.utcnow().isoformat())
+        timestamp = info_data.get('timestamp') or iso_now()
         user_agent = info_data.get('userAgent', 'Unknown')
         url = info_data.get('url', 'Unknown')
         
-        # Log with structured logging
-        logger.info(
-            "CLIENT-SIDE INFO",
-            message=message,
-            timestamp=timestamp,
-            user_agent=user_agent,
-            url=url,
-            client_ip=request.remote_addr
+        # Hand off to the client log writer
+        _record_client_log(
+            {
+                "event": "CLIENT-SIDE INFO",
+                "level": "info",
+                "message": message,
+                "timestamp": timestamp,
+                "user_agent": user_agent,
+                "url": url,
+                "client_ip": request.remote_addr,
+            }
         )
         
         return jsonify({"status": "logged", "message": "Info logged successfully"}), 200
@@ -1229,15 +2092,22 @@ def log_client_info():
         logger.error("Failed to log client info", error=str(e))
         return jsonify({"status": "error", "message": "Failed to log info"}), 500
 
+@app.route("/api/handbrake/event", methods=["POST"])
+def handbrake_event():
+    """Change notification from the HandBrake service; triggers a broadcast"""
+    _jobs_dirty.set()
+    return "", 204
+
+
 @app.route("/api/queue/clear", methods=["POST"])
 def clear_completed_jobs():
     """Clear completed jobs from database"""
     try:
-        db_path = os.getenv("DATABASE_PATH", "/app/data/handbrake2resilio.db")
-        with get_db_connection(db_path) as conn:
+        with _db_pool.transaction() as conn:
             cursor = conn.execute("DELETE FROM jobs WHERE status = 'completed'")
             cleared_count = cursor.rowcount
-            conn.commit()
+        if cleared_count:
+            _jobs_dirty.set()
         return jsonify({"success": True, "data": {"cleared_count": cleared_count}})
     except Exception as e:
         logger.error(f"Error clearing jobs: {e}")
@@ -1256,21 +2126,29 @@ def resume_queue():
     return jsonify({"success": True, "message": "Queue resumed"})
 
 
-@app.route("/")
-def root():
-    """Root endpoint"""
-    return jsonify(
+# The root payload only varies by HandBrake availability; encode both variants once.
+_ROOT_BODIES = {
+    available: dumps_bytes(
         {
             "name": "HandBrake2Resilio API Gateway",
             "version": "2.0.0",
             "status": "running",
             "services": {
                 "api_gateway": "running",
-                "handbrake_service": get_handbrake_service_status() is not None,
+                "handbrake_service": available,
                 "database": "sqlite",
             },
         }
     )
+    for available in (True, False)
+}
+
+
+@app.route("/")
+def root():
+    """Root endpoint"""
+    body = _ROOT_BODIES[get_handbrake_service_status() is not None]
+    return app.response_class(body, mimetype="application/json")
 
 
 if __name__ == "__main__":
@@ -1280,5 +2158,9 @@ if __name__ == "__main__":
     # Start real-time updates
     start_realtime_updates()
     
-    # Run the application
-    socketio.run(app, host="0.0.0.0", port=8080, debug=False, allow_unsafe_werkzeug=True)
+    # Run the application; eventlet/gevent serve with their own WSGI server,
+    # only threading mode falls back to Werkzeug's
+    run_kwargs = {}
+    if SOCKETIO_ASYNC_MODE == "threading":
+        run_kwargs["allow_unsafe_werkzeug"] = True
+    socketio.run(app, host="0.0.0.0", port=8080, debug=False, **run_kwargs)
@@ -4,8 +4,12 @@ Authentication system for HandBrake2Resilio
 Handles user authentication, JWT tokens, and password management
 """
 
+import hashlib
 import os
 import sys
+import threading
+import time
+from collections import OrderedDict
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -18,7 +22,7 @@ from functools import wraps
 from flask import request, jsonify, current_app
 import logging
 
-from shared.db import get_db_connection
+from shared.db import ConnectionPool
 
 logger = logging.getLogger(__name__)
 
@@ -26,15 +30,41 @@ logger = logging.getLogger(__name__)
 class AuthService:
     """Authentication service with JWT and bcrypt"""
 
+    # Connections kept open to the auth database; every request that checks
+    # a token borrows one, so they are reused rather than reopened
+    POOL_SIZE = 4
+    # Seconds a verified user lookup is reused before the users row is read
+    # again; bounds how long a deactivated account keeps a valid token working
+    USER_CACHE_TTL = 30.0
+    # Verified tokens remembered (LRU) so a repeated Bearer token skips the
+    # signature check too; entries live at most USER_CACHE_TTL seconds
+    TOKEN_CACHE_SIZE = 1024
+
     def __init__(self, config):
         self.config = config
         self.db_path = config.storage.database_path
+        # WAL/synchronous/busy_timeout come from get_db_connection
+        self._pool = ConnectionPool(
+            self.db_path,
+            size=self.POOL_SIZE,
+            pragmas=("PRAGMA cache_size=-20000", "PRAGMA temp_store=MEMORY"),
+        )
+        # user_id -> (checked_at, user info) for verify_token
+        self._user_cache: Dict[int, tuple] = {}
+        # token digest -> (expires_at, user info), least recently used first
+        self._token_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._user_cache_lock = threading.Lock()
+        # Signing key and algorithm list are fixed for the process lifetime;
+        # resolve them once instead of walking the config on every request.
+        self._jwt_key = config.security.jwt_secret_key
+        self._jwt_algorithm = config.security.jwt_algorithm
+        self._jwt_algorithms = [self._jwt_algorithm]
         self._init_database()
 
     def _init_database(self):
         """Initialize the authentication database"""
         try:
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 conn.execute(
                     """
                     CREATE TABLE IF NOT EXISTS users (
@@ -84,7 +114,6 @@ class AuthService:
                 if cursor.fetchone()[0] == 0:
                     self._create_default_admin(conn)
 
-                conn.commit()
                 logger.info("Authentication database initialized")
 
         except Exception as e:
@@ -129,7 +158,7 @@ class AuthService:
                 bcrypt.gensalt(self.config.security.bcrypt_rounds),
             ).decode("utf-8")
 
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 conn.execute(
                     """
                     INSERT INTO users (username, password_hash, email, role)
@@ -137,7 +166,6 @@ class AuthService:
                 """,
                     (username, password_hash, email, role),
                 )
-                conn.commit()
 
             logger.info(f"User registered: {username}")
             return True
@@ -152,7 +180,9 @@ class AuthService:
     def authenticate_user(self, username: str, password: str) -> Optional[Dict]:
         """Authenticate user and return user info if successful"""
         try:
-            with get_db_connection(self.db_path) as conn:
+            # The pool slot is released before bcrypt's ~250 ms check so slow
+            # or brute-force logins cannot starve other database callers
+            with self._pool.connection() as conn:
                 cursor = conn.execute(
                     """
                     SELECT id, username, password_hash, email, role, is_active
@@ -180,7 +210,7 @@ class AuthService:
                 return None
 
             # Update last login
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 conn.execute(
                     """
                     UPDATE users SET last_login = CURRENT_TIMESTAMP
@@ -188,7 +218,6 @@ class AuthService:
                 """,
                     (user_id,),
                 )
-                conn.commit()
 
             logger.info(f"User authenticated: {username}")
             return {"id": user_id, "username": username, "email": email, "role": role}
@@ -208,29 +237,37 @@ class AuthService:
             "iat": datetime.utcnow(),
         }
 
-        return jwt.encode(
-            payload,
-            self.config.security.jwt_secret_key,
-            algorithm=self.config.security.jwt_algorithm,
-        )
+        return jwt.encode(payload, self._jwt_key, algorithm=self._jwt_algorithm)
 
     def verify_token(self, token: str) -> Optional[Dict]:
         """Verify JWT token and return user info"""
         try:
-            payload = jwt.decode(
-                token,
-                self.config.security.jwt_secret_key,
-                algorithms=[self.config.security.jwt_algorithm],
-            )
+            key = hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+            with self._user_cache_lock:
+                hit = self._token_cache.get(key)
+                if hit:
+                    if time.monotonic() < hit[0]:
+                        self._token_cache.move_to_end(key)
+                        return hit[1]
+                    del self._token_cache[key]
+
+            payload = jwt.decode(token, self._jwt_key, algorithms=self._jwt_algorithms)
+            user_id = payload["user_id"]
+
+            with self._user_cache_lock:
+                cached = self._user_cache.get(user_id)
+            if cached and time.monotonic() - cached[0] < self.USER_CACHE_TTL:
+                self._remember_token(key, payload, cached[1])
+                return cached[1]
 
             # Check if user still exists and is active
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.execute(
                     """
                     SELECT id, username, email, role, is_active
                     FROM users WHERE id = ? AND is_active = 1
                 """,
-                    (payload["user_id"],),
+                    (user_id,),
                 )
                 user = cursor.fetchone()
 
@@ -238,12 +275,16 @@ class AuthService:
                 logger.warning(f"Token verification failed: user not found")
                 return None
 
-            return {
+            user_info = {
                 "id": user[0],
                 "username": user[1],
                 "email": user[2],
                 "role": user[3],
             }
+            with self._user_cache_lock:
+                self._user_cache[user_id] = (time.monotonic(), user_info)
+            self._remember_token(key, payload, user_info)
+            return user_info
 
         except jwt.ExpiredSignatureError:
             logger.warning("Token expired")
@@ -255,13 +296,32 @@ class AuthService:
             logger.error(f"Token verification error: {e}")
             return None
 
+    def _remember_token(self, key: bytes, payload: Dict, user_info: Dict) -> None:
+        """Cache a verified token until it expires or USER_CACHE_TTL passes"""
+        lifetime = min(payload["exp"] - time.time(), self.USER_CACHE_TTL)
+        if lifetime <= 0:
+            return
+        with self._user_cache_lock:
+            self._token_cache[key] = (time.monotonic() + lifetime, user_info)
+            self._token_cache.move_to_end(key)
+            if len(self._token_cache) > self.TOKEN_CACHE_SIZE:
+                self._token_cache.popitem(last=False)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop the cached verify_token lookups for ``user_id``"""
+        with self._user_cache_lock:
+            self._user_cache.pop(user_id, None)
+            stale = [k for k, (_, info) in self._token_cache.items() if info["id"] == user_id]
+            for k in stale:
+                del self._token_cache[k]
+
     def change_password(
         self, user_id: int, old_password: str, new_password: str
     ) -> bool:
         """Change user password"""
         try:
             # Get current password hash
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 cursor = conn.execute(
                     """
                     SELECT password_hash FROM users WHERE id = ?
@@ -288,15 +348,15 @@ class AuthService:
             ).decode("utf-8")
 
             # Update password
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 conn.execute(
                     """
                     UPDATE users SET password_hash = ? WHERE id = ?
                 """,
                     (new_hash, user_id),
                 )
-                conn.commit()
 
+            self.invalidate_user(user_id)
             logger.info(f"Password changed for user ID: {user_id}")
             return True
 
@@ -310,7 +370,7 @@ class AuthService:
             logger.info(f"📝 Creating tab '{name}' for user {user_id}")
             logger.info(f"📂 Source: {source_path}, Destination: {destination_path}")
             
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 cursor = conn.execute(
                     """
                     INSERT INTO tabs (name, source_path, destination_path, source_type, profile, user_id)
@@ -318,7 +378,6 @@ class AuthService:
                 """,
                     (name, source_path, destination_path, source_type, profile, user_id),
                 )
-                conn.commit()
                 tab_id = cursor.lastrowid
                 logger.info(f"✅ Tab created with ID: {tab_id}")
                 return tab_id
@@ -326,11 +385,42 @@ class AuthService:
             logger.error(f"❌ Failed to create tab: {e}")
             return None
 
+    def create_tabs_bulk(self, user_id, rows):
+        """Create several tabs in one transaction.
+
+        ``rows`` are dicts with name, source_path, destination_path, source_type
+        and profile. Returns the new tab ids in input order, or None on failure.
+        """
+        try:
+            with self._pool.transaction() as conn:
+                tab_ids = []
+                for row in rows:
+                    cursor = conn.execute(
+                        """
+                        INSERT INTO tabs (name, source_path, destination_path, source_type, profile, user_id)
+                        VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                        (
+                            row["name"],
+                            row["source_path"],
+                            row["destination_path"],
+                            row["source_type"],
+                            row["profile"],
+                            user_id,
+                        ),
+                    )
+                    tab_ids.append(cursor.lastrowid)
+            logger.info(f"✅ Created {len(tab_ids)} tabs for user {user_id}")
+            return tab_ids
+        except Exception as e:
+            logger.error(f"❌ Failed to bulk create tabs: {e}")
+            return None
+
     def get_tabs(self, user_id=None):
         """Get all tabs, optionally filtered by user"""
         try:
             logger.info(f"🔍 Getting tabs for user_id: {user_id}")
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.connection() as conn:
                 if user_id:
                     cursor = conn.execute("SELECT * FROM tabs WHERE user_id = ?", (user_id,))
                 else:
@@ -344,6 +434,16 @@ class AuthService:
             logger.error(f"❌ Failed to get tabs: {e}")
             return []
 
+    def get_tab(self, tab_id):
+        """Get a single tab by id, or None"""
+        try:
+            with self._pool.connection() as conn:
+                row = conn.execute("SELECT * FROM tabs WHERE id = ?", (tab_id,)).fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logger.error(f"❌ Failed to get tab {tab_id}: {e}")
+            return None
+
     def update_tab(self, tab_id, data):
         """Update a tab"""
         try:
@@ -360,9 +460,8 @@ class AuthService:
             values.append(tab_id)
             query = f"UPDATE tabs SET {', '.join(fields)} WHERE id = ?"
             
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 conn.execute(query, values)
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Failed to update tab: {e}")
@@ -371,9 +470,8 @@ class AuthService:
     def delete_tab(self, tab_id):
         """Delete a tab"""
         try:
-            with get_db_connection(self.db_path) as conn:
+            with self._pool.transaction() as conn:
                 conn.execute("DELETE FROM tabs WHERE id = ?", (tab_id,))
-                conn.commit()
                 return True
         except Exception as e:
             logger.error(f"Failed to delete tab: {e}")
@@ -385,12 +483,16 @@ def require_auth(f):
 
     @wraps(f)
     def decorated_function(*args, **kwargs):
+        # Already verified earlier in this request
+        if getattr(request, "user", None):
+            return f(*args, **kwargs)
+
         token = None
 
         # Get token from header
         auth_header = request.headers.get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
-            token = auth_header.split(" ")[1]
+            token = auth_header[7:].partition(" ")[0]
 
         if not token:
             return jsonify({"error": "Token is missing"}), 401
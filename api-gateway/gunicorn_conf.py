@@ -0,0 +1,44 @@
+"""
+Gunicorn settings for the API gateway container.
+
+Local development still runs ``python3 api_gateway_simple.py`` (socketio.run).
+"""
+
+import os
+import sys
+from importlib.util import find_spec
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.config import config
+
+# Same default as api_gateway_simple: eventlet when installed, else threads
+_async_mode = os.getenv("SOCKETIO_ASYNC_MODE") or (
+    "eventlet" if find_spec("eventlet") else "threading"
+)
+
+bind = f"{config.network.host}:{config.network.port}"
+
+# Socket.IO sessions live in one process's memory. Running more than one
+# worker needs sticky sessions at the proxy and SOCKETIO_MESSAGE_QUEUE so
+# request-driven events reach every worker's clients, so the default is a
+# single worker. Each worker runs its own realtime loop and sends
+# system_update only to its local clients, bypassing the queue.
+workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+worker_class = {"eventlet": "eventlet", "gevent": "gevent"}.get(_async_mode, "gthread")
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "10000"))
+threads = int(os.getenv("GUNICORN_THREADS", "100"))  # gthread only
+keepalive = 5
+timeout = 120
+
+# SQLite connections and the realtime threads must not cross fork(), so the
+# app is imported in each worker rather than preloaded in the master.
+preload_app = False
+reload = False
+
+
+def post_worker_init(worker):
+    """Start the realtime update loop once the worker has loaded the app."""
+    import api_gateway_simple
+
+    api_gateway_simple.start_realtime_updates()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Request body schemas for the API gateway
+Typed dataclasses validated in a single pass over the decoded JSON body
+"""
+
+from dataclasses import MISSING, dataclass, fields
+from typing import Any, Dict, Tuple, Type, TypeVar, get_type_hints
+
+T = TypeVar("T")
+
+# Per-schema (name, type, default) tuples, resolved once at import time
+_FIELD_SPECS: Dict[type, Tuple[Tuple[str, type, Any], ...]] = {}
+
+
+class SchemaError(ValueError):
+    """Raised when a request body does not match its schema"""
+
+
+def schema(cls: Type[T]) -> Type[T]:
+    """Register a dataclass as a request schema and precompute its field specs"""
+    cls = dataclass(frozen=True)(cls)
+    hints = get_type_hints(cls)
+    _FIELD_SPECS[cls] = tuple(
+        (f.name, hints[f.name], f.default) for f in fields(cls)
+    )
+    return cls
+
+
+def parse_body(cls: Type[T], data: Any) -> T:
+    """Validate decoded JSON ``data`` against schema ``cls``.
+
+    Unknown keys are ignored. ``int`` fields accept numeric strings, matching
+    the coercion the handlers used to do by hand.
+    """
+    if not isinstance(data, dict):
+        raise SchemaError("Request body must be a JSON object")
+
+    values = {}
+    for name, expected, default in _FIELD_SPECS[cls]:
+        value = data.get(name)
+        if value is None:
+            if default is MISSING:
+                raise SchemaError(f"{name} is required")
+            values[name] = default
+            continue
+        if expected is int:
+            if isinstance(value, bool):
+                raise SchemaError(f"{name} must be an integer")
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise SchemaError(f"{name} must be an integer") from None
+        elif not isinstance(value, expected):
+            raise SchemaError(f"{name} must be a {expected.__name__}")
+        values[name] = value
+    return cls(**values)
+
+
+@schema
+class CredentialsRequest:
+    """Body of /api/auth/login and /api/auth/register"""
+
+    username: str = ""
+    password: str = ""
+
+
+@schema
+class CreateTabRequest:
+    """Body of POST /api/tabs"""
+
+    name: str = "New Tab"
+    source_path: str = ""
+    destination_path: str = ""
+    source_type: str = "tv"
+    profile: str = "standard"
+
+
+@schema
+class AddJobRequest:
+    """Body of POST /api/jobs/add"""
+
+    input_path: str
+    output_path: str = ""
+    quality: int = 23
+    resolution: str = "1280x720"
+    video_bitrate: int = 1000
+    audio_bitrate: int = 96
@@ -4,6 +4,7 @@ HandBrake Service for HandBrake2Resilio (Simplified)
 Provides REST API interface for video conversion operations with SQLite storage
 """
 
+import hashlib
 import os
 import re
 import sys
@@ -11,16 +12,24 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import logging
 import threading
 import time
-import json
 import subprocess
+import uuid
+import psutil
 from datetime import datetime
 from flask import Flask, jsonify, request
 from flask_cors import CORS
 import structlog
 
 # Import our modules
-from shared.db import get_db_connection
+from shared.clock import iso_now
+from shared.db import ConnectionPool
 from shared.job_queue import ConversionJob, JobStatus
+from shared.json_utils import OrjsonProvider, dumps_bytes, orjson_response
+from shared.logging_setup import (
+    configure_queue_logging,
+    configure_structlog,
+    quiet_access_log,
+)
 
 OUTPUT_ROOT = os.environ.get("OUTPUT_ROOT", "/media/output")
 
@@ -90,23 +99,10 @@ os.makedirs("logs", exist_ok=True)
 os.makedirs("data", exist_ok=True)
 
 # Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(),
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+configure_structlog()
+configure_queue_logging()
+# The gateway probes /health every few seconds; /metrics is scraped
+quiet_access_log(paths=("/health", "/metrics"))
 
 logger = structlog.get_logger()
 
@@ -114,7 +110,7 @@ logger = structlog.get_logger()
 def check_media_directories() -> None:
     """Warn at startup if standard Docker mount points are missing or unusable."""
     input_root = INPUT_MOUNT_PREFIX
-    output_root = os.environ.get("OUTPUT_ROOT", "/media/output")
+    output_root = OUTPUT_ROOT
     if not os.path.isdir(input_root):
         logger.warning(
             "media input mount missing or not a directory — conversions require paths under /media/input",
@@ -132,6 +128,7 @@ def check_media_directories() -> None:
 
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 CORS(app)
 check_media_directories()
 
@@ -139,12 +136,23 @@ check_media_directories()
 active_jobs = {}
 job_lock = threading.Lock()
 
+DB_PATH = os.getenv("DATABASE_PATH", "/data/handbrake.db")
+
+# Connections reused across requests and conversion threads instead of one
+# connect per call; each keeps its page and statement caches warm.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+MAX_CONCURRENT_JOBS = int(os.getenv("MAX_CONCURRENT_JOBS", 8))
+_db_pool = ConnectionPool(
+    DB_PATH,
+    size=DB_POOL_SIZE,
+    # WAL/synchronous/busy_timeout come from get_db_connection
+    pragmas=("PRAGMA cache_size=-32000", "PRAGMA temp_store=MEMORY"),
+)
+
 
 def init_job_database():
     """Initialize SQLite database for job tracking"""
-    db_path = os.getenv("DATABASE_PATH", "/data/handbrake.db")
-
-    with get_db_connection(db_path) as conn:
+    with _db_pool.transaction() as conn:
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS jobs (
@@ -166,25 +174,69 @@ def init_job_database():
             )
         """
         )
-        conn.commit()
-        logger.info("Job database initialized")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs(created_at DESC)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status)")
+    logger.info("Job database initialized")
 
 
 # Initialize database
 init_job_database()
 
 
+# Latest CPU percentage from the background sampler. psutil needs a sampling
+# window to measure CPU, so requests read this value instead of sleeping.
+CPU_SAMPLE_INTERVAL = 1.0
+_cpu_percent = 0.0
+_cpu_sampler_thread = None
+_cpu_sampler_lock = threading.Lock()
+
+
+def _cpu_sampler():
+    """Refresh _cpu_percent once per CPU_SAMPLE_INTERVAL, forever."""
+    global _cpu_percent
+
+    while True:
+        try:
+            _cpu_percent = psutil.cpu_percent(interval=CPU_SAMPLE_INTERVAL)
+        except Exception as e:
+            logger.error(f"CPU sampler error: {e}")
+            time.sleep(CPU_SAMPLE_INTERVAL)
+
+
+def get_cpu_percent():
+    """Return the last sampled CPU percentage, starting the sampler on first use"""
+    global _cpu_sampler_thread
+    if _cpu_sampler_thread is None:
+        with _cpu_sampler_lock:
+            if _cpu_sampler_thread is None:
+                _cpu_sampler_thread = threading.Thread(
+                    target=_cpu_sampler, name="cpu-sampler", daemon=True
+                )
+                _cpu_sampler_thread.start()
+    return _cpu_percent
+
+
+# /health, /metrics and can_start_job share one memory/disk read per
+# SYSTEM_USAGE_TTL seconds; CPU comes from the sampler thread
+SYSTEM_USAGE_TTL = 2.0
+_usage_cache = {"checked_at": float("-inf"), "value": None}
+_usage_lock = threading.Lock()
+
+
 def get_system_usage():
     """Get current system resource usage"""
     try:
-        import psutil
-
-        cpu_percent = psutil.cpu_percent(interval=1)
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage("/")
+        with _usage_lock:
+            now = time.monotonic()
+            if now - _usage_cache["checked_at"] >= SYSTEM_USAGE_TTL:
+                _usage_cache["value"] = (psutil.virtual_memory(), psutil.disk_usage("/"))
+                _usage_cache["checked_at"] = now
+            memory, disk = _usage_cache["value"]
 
         return {
-            "cpu_percent": cpu_percent,
+            "cpu_percent": get_cpu_percent(),
             "memory_percent": memory.percent,
             "memory_available_gb": memory.available / (1024**3),
             "disk_percent": disk.percent,
@@ -201,119 +253,145 @@ def get_system_usage():
         }
 
 
-def can_start_job():
-    """Check if system can handle another job"""
-    usage = get_system_usage()
-    max_jobs = int(os.getenv("MAX_CONCURRENT_JOBS", 8))
+def _has_resource_headroom(usage):
+    """Whether ``usage`` leaves room for another conversion"""
+    return (
+        usage["cpu_percent"] < 80
+        and usage["memory_percent"] < 80
+        and usage["disk_free_gb"] > 5
+    )
+
+
+def available_job_slots():
+    """How many more jobs can start now; 0 when resources are exhausted"""
+    if not _has_resource_headroom(get_system_usage()):
+        return 0
 
     with job_lock:
         active_count = len(
             [entry["job"] for entry in active_jobs.values() if entry["job"].status == JobStatus.RUNNING]
         )
 
+    return max(MAX_CONCURRENT_JOBS - active_count, 0)
+
+
+def can_start_job():
+    """Check if system can handle another job"""
+    return available_job_slots() > 0
+
+
+# Gateway endpoint told about job changes so it can push them to clients
+# without polling; unset disables the notifications.
+GATEWAY_EVENT_URL = os.getenv("GATEWAY_EVENT_URL")
+# Minimum seconds between notifications; progress bursts collapse into one
+GATEWAY_EVENT_MIN_INTERVAL = 0.5
+_gateway_event = threading.Event()
+_gateway_notifier_thread = None
+_gateway_notifier_lock = threading.Lock()
+
+
+def _gateway_notifier():
+    """POST one change notification per burst of job updates, forever."""
+    import requests
+
+    session = requests.Session()
+    while True:
+        _gateway_event.wait()
+        _gateway_event.clear()
+        try:
+            session.post(GATEWAY_EVENT_URL, timeout=2)
+        except Exception as e:
+            logger.debug(f"Gateway notification failed: {e}")
+        time.sleep(GATEWAY_EVENT_MIN_INTERVAL)
+
+
+def notify_gateway():
+    """Flag a job change for the gateway, starting the notifier on first use"""
+    global _gateway_notifier_thread
+    if not GATEWAY_EVENT_URL:
+        return
+    if _gateway_notifier_thread is None:
+        with _gateway_notifier_lock:
+            if _gateway_notifier_thread is None:
+                _gateway_notifier_thread = threading.Thread(
+                    target=_gateway_notifier, name="GatewayNotifier", daemon=True
+                )
+                _gateway_notifier_thread.start()
+    _gateway_event.set()
+
+
+_INSERT_JOB_SQL = """
+    INSERT OR REPLACE INTO jobs (
+        id, input_path, output_path, quality, resolution,
+        video_bitrate, audio_bitrate, status, progress,
+        error_message, retry_count, max_retries,
+        created_at, started_at, completed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+_SELECT_JOB_SQL = "SELECT * FROM jobs WHERE id = ?"
+
+
+def _job_row(job):
+    """Parameter tuple for _INSERT_JOB_SQL"""
     return (
-        usage["cpu_percent"] < 80
-        and usage["memory_percent"] < 80
-        and usage["disk_free_gb"] > 5
-        and active_count < max_jobs
+        job.id,
+        job.input_path,
+        job.output_path,
+        job.quality,
+        job.resolution,
+        job.video_bitrate,
+        job.audio_bitrate,
+        job.status.value,
+        job.progress,
+        job.error_message,
+        job.retry_count,
+        job.max_retries,
+        job.created_at.isoformat() if job.created_at else None,
+        job.started_at.isoformat() if job.started_at else None,
+        job.completed_at.isoformat() if job.completed_at else None,
     )
 
 
+def save_jobs_to_db(jobs):
+    """Save several jobs to SQLite in one write transaction"""
+    with _db_pool.transaction(immediate=True) as conn:
+        conn.executemany(_INSERT_JOB_SQL, [_job_row(job) for job in jobs])
+    notify_gateway()
+
+
 def save_job_to_db(job):
     """Save job to SQLite database"""
-    db_path = os.getenv("DATABASE_PATH", "/data/handbrake.db")
-
-    with get_db_connection(db_path) as conn:
-        conn.execute(
-            """
-            INSERT OR REPLACE INTO jobs (
-                id, input_path, output_path, quality, resolution,
-                video_bitrate, audio_bitrate, status, progress,
-                error_message, retry_count, max_retries,
-                created_at, started_at, completed_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-            (
-                job.id,
-                job.input_path,
-                job.output_path,
-                job.quality,
-                job.resolution,
-                job.video_bitrate,
-                job.audio_bitrate,
-                job.status.value,
-                job.progress,
-                job.error_message,
-                job.retry_count,
-                job.max_retries,
-                job.created_at.isoformat() if job.created_at else None,
-                job.started_at.isoformat() if job.started_at else None,
-                job.completed_at.isoformat() if job.completed_at else None,
-            ),
-        )
-        conn.commit()
+    save_jobs_to_db((job,))
 
 
 def get_job_from_db(job_id):
     """Get job from SQLite database"""
-    db_path = os.getenv("DATABASE_PATH", "/data/handbrake.db")
-
-    with get_db_connection(db_path) as conn:
-        cursor = conn.execute(
-            """
-            SELECT * FROM jobs WHERE id = ?
-        """,
-            (job_id,),
-        )
+    with _db_pool.connection() as conn:
+        cursor = conn.execute(_SELECT_JOB_SQL, (job_id,))
         row = cursor.fetchone()
+        return ConversionJob.from_row(row) if row else None
 
-        if row:
-            # Convert row to ConversionJob object
-            job = ConversionJob(
-                id=row[0],
-                input_path=row[1],
-                output_path=row[2],
-                quality=row[3],
-                resolution=row[4],
-                video_bitrate=row[5],
-                audio_bitrate=row[6],
-                status=JobStatus(row[7]),
-                progress=row[8],
-                error_message=row[9],
-                retry_count=row[10],
-                max_retries=row[11],
-            )
-            return job
-        return None
+
+# The to_dict() columns in order, newest first
+_SELECT_ALL_JOBS_SQL = """
+    SELECT id, input_path, output_path, quality, resolution,
+           video_bitrate, audio_bitrate, status, progress,
+           error_message, retry_count, max_retries,
+           created_at, started_at, completed_at,
+           0 AS estimated_duration
+    FROM jobs ORDER BY created_at DESC
+"""
 
 
 def get_all_jobs_from_db():
     """Get all jobs from SQLite database"""
-    db_path = os.getenv("DATABASE_PATH", "/data/handbrake.db")
-
-    with get_db_connection(db_path) as conn:
-        cursor = conn.execute("SELECT * FROM jobs ORDER BY created_at DESC")
-        rows = cursor.fetchall()
-
-        jobs = []
-        for row in rows:
-            job = ConversionJob(
-                id=row[0],
-                input_path=row[1],
-                output_path=row[2],
-                quality=row[3],
-                resolution=row[4],
-                video_bitrate=row[5],
-                audio_bitrate=row[6],
-                status=JobStatus(row[7]),
-                progress=row[8],
-                error_message=row[9],
-                retry_count=row[10],
-                max_retries=row[11],
-            )
-            jobs.append(job.to_dict())
-
-        return jobs
+    with _db_pool.connection() as conn:
+        cursor = conn.execute(_SELECT_ALL_JOBS_SQL)
+        # Columns match ConversionJob.to_dict(); build the dicts straight
+        # from the rows instead of round-tripping through ConversionJob
+        return [dict(row) for row in cursor]
 
 
 _PROGRESS_RE = re.compile(r'(\d+\.\d+) %')
@@ -459,88 +537,134 @@ def health_check():
                 [e for e in active_jobs.values() if e["job"].status == JobStatus.RUNNING]
             )
 
-        return jsonify(
-            {
-                "status": "healthy",
-                "timestamp": datetime.utcnow().isoformat(),
-                "service": "handbrake",
-                "system": usage,
-                "active_jobs": active_count,
-                "database": "sqlite",
-            }
+        snapshot = {
+            "status": "healthy",
+            "service": "handbrake",
+            "system": usage,
+            "active_jobs": active_count,
+            "database": "sqlite",
+        }
+        # Weak ETag over the fields that change rarely; pollers revalidate with
+        # If-None-Match and get an empty 304 while they hold. The live usage
+        # figures move on every sample, so only the headroom verdict counts.
+        stable = (
+            snapshot["status"],
+            active_count,
+            _has_resource_headroom(usage),
         )
+        etag = hashlib.blake2b(dumps_bytes(stable), digest_size=8).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            response = app.response_class(status=304)
+        else:
+            response = orjson_response({**snapshot, "timestamp": iso_now()})
+        response.set_etag(etag, weak=True)
+        response.headers["Cache-Control"] = "max-age=2"
+        return response
     except Exception as e:
         logger.error(f"Health check failed: {e}")
         return jsonify({"status": "unhealthy", "error": str(e)}), 500
 
 
+# Prometheus gauges served by /metrics: (name, help text)
+_METRIC_GAUGES = (
+    ("h2r_cpu_percent", "System CPU usage percent"),
+    ("h2r_memory_percent", "System memory usage percent"),
+    ("h2r_running_jobs", "Jobs currently converting"),
+)
+
+
+@app.route("/metrics")
+def metrics():
+    """Prometheus text-format gauges, computed when scraped"""
+    usage = get_system_usage()
+    with job_lock:
+        running = sum(
+            1 for e in active_jobs.values() if e["job"].status == JobStatus.RUNNING
+        )
+    values = (usage["cpu_percent"], usage["memory_percent"], running)
+    lines = []
+    for (name, help_text), value in zip(_METRIC_GAUGES, values):
+        lines.append(
+            f"# HELP {name} {help_text}\n# TYPE {name} gauge\n{name} {value}\n"
+        )
+    return app.response_class("".join(lines), mimetype="text/plain; version=0.0.4")
+
+
+class _JobRequestError(ValueError):
+    """A /convert request body that cannot become a job"""
+
+    def __init__(self, error, message):
+        super().__init__(message)
+        self.error = error
+        self.message = message
+
+
+def _job_from_request(data):
+    """Validate one /convert body and build its ConversionJob"""
+    if not isinstance(data, dict):
+        raise _JobRequestError("Invalid request", "Job must be a JSON object")
+
+    input_path = data.get("input_path")
+    raw_output = data.get("output_path")
+
+    if not input_path:
+        raise _JobRequestError("Missing required fields", "input_path is required")
+
+    if not validate_input_path(input_path):
+        raise _JobRequestError(
+            "Invalid input_path",
+            "input_path must be under /media/input with no path traversal (..)",
+        )
+
+    if raw_output is not None and str(raw_output).strip():
+        output_path = str(raw_output).strip()
+    else:
+        output_path = default_output_path_from_input(input_path)
+
+    return ConversionJob(
+        id=data.get("job_id") or data.get("id") or str(uuid.uuid4()),
+        input_path=input_path,
+        output_path=output_path,
+        quality=data.get("quality", 23),
+        resolution=data.get("resolution", "720x480"),
+        video_bitrate=data.get("video_bitrate", 1000),
+        audio_bitrate=data.get("audio_bitrate", 96),
+    )
+
+
+def _start_conversion_thread(job):
+    """Run the conversion for an already saved job in a background thread"""
+    thread = threading.Thread(target=run_handbrake_conversion, args=(job,))
+    thread.daemon = True
+    thread.start()
+
+
+_OVERLOADED_RESPONSE = {
+    "error": "System overloaded",
+    "message": "System resources are currently at capacity",
+}
+
+
 @app.route("/convert", methods=["POST"])
 def start_conversion():
     """Start a new video conversion job"""
     try:
-        data = request.get_json()
-
-        # Validate required fields
-        input_path = data.get("input_path")
-        raw_output = data.get("output_path")
-
-        if not input_path:
-            return (
-                jsonify(
-                    {
-                        "error": "Missing required fields",
-                        "message": "input_path is required",
-                    }
-                ),
-                400,
-            )
-
-        if not validate_input_path(input_path):
-            return (
-                jsonify(
-                    {
-                        "error": "Invalid input_path",
-                        "message": "input_path must be under /media/input with no path traversal (..)",
-                    }
-                ),
-                400,
-            )
+        data = request.get_json(silent=True)
 
-        if raw_output is not None and str(raw_output).strip():
-            output_path = str(raw_output).strip()
-        else:
-            output_path = default_output_path_from_input(input_path)
+        try:
+            job = _job_from_request(data)
+        except _JobRequestError as e:
+            return jsonify({"error": e.error, "message": e.message}), 400
 
         # Check if system can handle the job
         if not can_start_job():
-            return (
-                jsonify(
-                    {
-                        "error": "System overloaded",
-                        "message": "System resources are currently at capacity",
-                    }
-                ),
-                503,
-            )
-
-        # Create job
-        job = ConversionJob(
-            id=data.get("job_id") or data.get("id") or f"job_{int(time.time())}",
-            input_path=input_path,
-            output_path=output_path,
-            quality=data.get("quality", 23),
-            resolution=data.get("resolution", "720x480"),
-            video_bitrate=data.get("video_bitrate", 1000),
-            audio_bitrate=data.get("audio_bitrate", 96),
-        )
+            return jsonify(_OVERLOADED_RESPONSE), 503
 
         # Save to database
         save_job_to_db(job)
 
         # Start conversion in background thread
-        thread = threading.Thread(target=run_handbrake_conversion, args=(job,))
-        thread.daemon = True
-        thread.start()
+        _start_conversion_thread(job)
 
         logger.info(f"Started conversion job {job.id}")
 
@@ -553,6 +677,61 @@ def start_conversion():
         return jsonify({"error": "Failed to start conversion", "message": str(e)}), 500
 
 
+@app.route("/convert/bulk", methods=["POST"])
+def start_conversions_bulk():
+    """Start several conversion jobs; valid ones are saved in one transaction.
+
+    At most the free ``MAX_CONCURRENT_JOBS`` slots are started; rows past
+    that are reported as overloaded. Returns per-row ``{"job_id", "error"}``
+    results in input order.
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not isinstance(data, list) or not data:
+            return (
+                jsonify(
+                    {
+                        "error": "Invalid request",
+                        "message": "Expected a non-empty JSON array of jobs",
+                    }
+                ),
+                400,
+            )
+
+        slots = available_job_slots()
+        if not slots:
+            return jsonify(_OVERLOADED_RESPONSE), 503
+
+        results = []
+        jobs = []
+        for item in data:
+            try:
+                job = _job_from_request(item)
+            except _JobRequestError as e:
+                job_id = item.get("job_id") if isinstance(item, dict) else None
+                results.append({"job_id": job_id, "error": e.message})
+                continue
+            if len(jobs) >= slots:
+                results.append(
+                    {"job_id": job.id, "error": _OVERLOADED_RESPONSE["message"]}
+                )
+                continue
+            jobs.append(job)
+            results.append({"job_id": job.id, "error": None})
+
+        if jobs:
+            save_jobs_to_db(jobs)
+            for job in jobs:
+                _start_conversion_thread(job)
+
+        logger.info(f"Started {len(jobs)}/{len(data)} bulk conversion jobs")
+        return jsonify({"results": results, "count": len(jobs)})
+
+    except Exception as e:
+        logger.error(f"Error starting bulk conversion: {e}")
+        return jsonify({"error": "Failed to start conversion", "message": str(e)}), 500
+
+
 @app.route("/job/<job_id>", methods=["GET"])
 def get_job_status(job_id):
     """Get status of a specific job"""
@@ -591,7 +770,7 @@ def list_jobs():
             for entry in active_jobs.values():
                 jobs.append(entry["job"].to_dict())
 
-        return jsonify({"jobs": jobs, "count": len(jobs)})
+        return orjson_response({"jobs": jobs, "count": len(jobs)})
 
     except Exception as e:
         logger.error(f"Error listing jobs: {e}")
@@ -743,9 +922,9 @@ def root():
 if __name__ == "__main__":
     # Log startup information
     logger.info("Starting HandBrake Service (Simplified)...")
-    logger.info(f"Max concurrent jobs: {os.getenv('MAX_CONCURRENT_JOBS', 8)}")
+    logger.info(f"Max concurrent jobs: {MAX_CONCURRENT_JOBS}")
     logger.info(
-        f"Database Path: {os.getenv('DATABASE_PATH', '/data/handbrake.db')}"
+        f"Database Path: {DB_PATH}"
     )
 
     # Start the service
@@ -0,0 +1,19 @@
+"""Cheap wall-clock timestamps for API payloads."""
+
+from __future__ import annotations
+
+import time
+
+# (epoch second, formatted) pair; swapped as a whole so readers never see a torn update
+_iso_now_cache = (0, "")
+
+
+def iso_now() -> str:
+    """Current UTC time as ISO-8601 (second resolution), formatted once per second."""
+    global _iso_now_cache
+    now = int(time.time())
+    cached = _iso_now_cache
+    if cached[0] != now:
+        cached = (now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)))
+        _iso_now_cache = cached
+    return cached[1]
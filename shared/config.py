@@ -507,7 +507,9 @@ def load_config() -> Config:
             logger.error("System requirements validation failed")
             sys.exit(1)
 
-        logger.info("Configuration loaded successfully", extra=config.to_dict())
+        # to_dict() walks the whole config; only build it if the line is emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Configuration loaded successfully", extra=config.to_dict())
         return config
 
     except ValueError as e:
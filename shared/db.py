@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import queue
 import sqlite3
+import threading
 import time
-from typing import Callable, Optional, TypeVar
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -12,6 +15,12 @@ T = TypeVar("T")
 _DEFAULT_LOCK_WAIT_SECONDS = 30.0
 # Default SQLite busy_handler timeout in milliseconds (PRAGMA busy_timeout).
 _DEFAULT_BUSY_TIMEOUT_MS = 30000
+# sqlite3's own default prepared-statement cache size per connection.
+_DEFAULT_CACHED_STATEMENTS = 128
+
+# Database files already switched to WAL by this process. journal_mode=WAL is
+# persistent, so later connections to the same file skip the PRAGMA.
+_wal_paths: set = set()
 
 
 def _is_locked_operational_error(exc: BaseException) -> bool:
@@ -51,17 +60,22 @@ def get_db_connection(
     timeout: int = _DEFAULT_BUSY_TIMEOUT_MS,
     *,
     lock_wait_seconds: float = _DEFAULT_LOCK_WAIT_SECONDS,
+    cached_statements: int = _DEFAULT_CACHED_STATEMENTS,
 ) -> sqlite3.Connection:
     """
     Open a SQLite connection with WAL journal mode and busy timeout.
 
     WAL mode allows concurrent readers with one writer, reducing
     ``database is locked`` errors when multiple services use the same file.
+    It needs the database on a local filesystem (not NFS/SMB). The mode is
+    stored in the file, so it is only set on the first connection per path.
 
     Args:
         db_path: Path to the SQLite database file.
         timeout: ``PRAGMA busy_timeout`` value in **milliseconds** (default 30000).
         lock_wait_seconds: ``sqlite3.connect`` timeout in **seconds** (default 30).
+        cached_statements: Size of the connection's prepared-statement cache;
+            raise it for long-lived connections that run many distinct queries.
 
     Returns:
         sqlite3.Connection with WAL mode and busy timeout set.
@@ -70,14 +84,121 @@ def get_db_connection(
         db_path,
         check_same_thread=False,
         timeout=lock_wait_seconds,
+        cached_statements=cached_statements,
     )
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL;")
+    if db_path not in _wal_paths:
+        mode = conn.execute("PRAGMA journal_mode=WAL;").fetchone()[0]
+        # In-memory databases report "memory" and must be set every time
+        if mode == "wal":
+            _wal_paths.add(db_path)
     conn.execute(f"PRAGMA busy_timeout={timeout};")
     conn.execute("PRAGMA synchronous=NORMAL;")
     return conn
 
 
+class ConnectionPool:
+    """
+    Fixed-size pool of SQLite connections opened with :func:`get_db_connection`.
+
+    Connections are opened lazily, up to *size*, and reused afterwards so each
+    keeps its page and prepared-statement caches warm. A sqlite3 connection
+    must not be used by two threads at once; the pool hands each one to a
+    single caller at a time and blocks further callers until one is returned.
+
+    Args:
+        db_path: Path to the SQLite database file.
+        size: Maximum number of open connections.
+        pragmas: Extra ``PRAGMA`` statements run once on each new connection.
+        cached_statements: Prepared-statement cache size per connection.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        size: int = 8,
+        *,
+        pragmas: Iterable[str] = (),
+        cached_statements: int = _DEFAULT_CACHED_STATEMENTS,
+    ) -> None:
+        if size < 1:
+            raise ValueError("ConnectionPool size must be at least 1")
+        self.db_path = db_path
+        self.size = size
+        self._pragmas = tuple(pragmas)
+        self._cached_statements = cached_statements
+        # LIFO so the most recently used (warmest) connection is reused first
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = get_db_connection(
+            self.db_path, cached_statements=self._cached_statements
+        )
+        for pragma in self._pragmas:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get()
+        try:
+            return self._open()
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        # Never hand the next caller a connection holding an open transaction
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection; uncommitted work is rolled back on return."""
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def transaction(self, immediate: bool = False) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection inside a transaction (commit, or rollback on error).
+
+        With ``immediate=True`` the transaction starts with ``BEGIN IMMEDIATE``,
+        taking the write lock up front instead of upgrading a read lock on the
+        first write; use it for transactions that are known to write.
+        """
+        with self.connection() as conn:
+            with conn:
+                if immediate:
+                    conn.execute("BEGIN IMMEDIATE")
+                yield conn
+
+    def close(self) -> None:
+        """Close every idle connection (connections still borrowed are left open)."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
 def execute_with_retry(
     conn: sqlite3.Connection,
     sql: str,
@@ -115,6 +236,32 @@ def execute_with_retry(
     raise last_err
 
 
+def executemany_with_retry(
+    conn: sqlite3.Connection,
+    sql: str,
+    seq_of_params: Iterable[tuple],
+    max_retries: int = 3,
+    backoff: float = 1.0,
+) -> sqlite3.Cursor:
+    """Run one prepared statement over many parameter rows, retrying on lock.
+
+    Args:
+        conn: Open SQLite connection.
+        sql: SQL statement to execute for each row.
+        seq_of_params: Bind parameters, one tuple per row. Materialized once
+            so a retry replays the same rows.
+        max_retries: Maximum number of retry attempts.
+        backoff: Seconds to wait between retries.
+
+    Returns:
+        sqlite3.Cursor from the successful executemany call.
+    """
+    rows = list(seq_of_params)
+    return _retry_on_locked(
+        lambda: conn.executemany(sql, rows), max_retries=max_retries, backoff=backoff
+    )
+
+
 def commit_with_retry(
     conn: sqlite3.Connection,
     max_retries: int = 3,
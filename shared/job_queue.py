@@ -4,22 +4,50 @@ Job Queue System for HandBrake2Resilio
 Handles video conversion jobs with resource management and error recovery
 """
 
+import heapq
+import itertools
 import threading
 import time
 import queue
 import psutil
 import os
+import re
+import signal
 import subprocess
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from enum import Enum
 import logging
 
-from shared.db import commit_with_retry, execute_with_retry, get_db_connection
+from shared.db import (
+    ConnectionPool,
+    commit_with_retry,
+    execute_with_retry,
+    executemany_with_retry,
+)
 
 logger = logging.getLogger(__name__)
 
+# HandBrakeCLI progress line: "Encoding: task 1 of 1, 42.17 % (...)"
+_PROGRESS_RE = re.compile(r"Encoding: task \d+ of \d+, (\d+(?:\.\d+)?) %")
+
+# Conversion wrapper script run for each job
+CONVERSION_SCRIPT = "/app/handbrake2resilio.sh"
+
+
+def _signal_process_group(process: subprocess.Popen, sig: int) -> None:
+    """Signal a conversion and everything it spawned (it leads its own session)"""
+    try:
+        os.killpg(process.pid, sig)
+    except ProcessLookupError:
+        pass
+
+
+# Queued once per worker by JobQueue.shutdown() to wake and stop it
+_SHUTDOWN_SENTINEL = object()
+
 
 class JobStatus(Enum):
     """Job status enumeration"""
@@ -32,6 +60,20 @@ class JobStatus(Enum):
     RETRYING = "retrying"
 
 
+# Stored status string -> member; a plain dict lookup instead of JobStatus(value)
+STATUS_BY_VALUE: Dict[str, JobStatus] = {status.value: status for status in JobStatus}
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse a stored ISO / SQLite CURRENT_TIMESTAMP value; None if empty or invalid"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
 @dataclass
 class ConversionJob:
     """Video conversion job data"""
@@ -57,20 +99,65 @@ class ConversionJob:
         if self.created_at is None:
             self.created_at = datetime.utcnow()
 
+    @classmethod
+    def from_row(cls, row) -> "ConversionJob":
+        """Build a job from a ``sqlite3.Row`` of the jobs table, reading columns by name"""
+        return cls(
+            id=row["id"],
+            input_path=row["input_path"],
+            output_path=row["output_path"],
+            quality=row["quality"],
+            resolution=row["resolution"],
+            video_bitrate=row["video_bitrate"],
+            audio_bitrate=row["audio_bitrate"],
+            status=STATUS_BY_VALUE[row["status"]],
+            progress=row["progress"],
+            error_message=row["error_message"],
+            retry_count=row["retry_count"],
+            max_retries=row["max_retries"],
+            created_at=_parse_timestamp(row["created_at"]),
+            started_at=_parse_timestamp(row["started_at"]),
+            completed_at=_parse_timestamp(row["completed_at"]),
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
-        data = asdict(self)
-        data["status"] = self.status.value
-        data["created_at"] = self.created_at.isoformat() if self.created_at else None
-        data["started_at"] = self.started_at.isoformat() if self.started_at else None
-        data["completed_at"] = (
-            self.completed_at.isoformat() if self.completed_at else None
-        )
-        return data
+        # Every field is a scalar, so a flat literal replaces asdict()'s
+        # recursive deepcopy
+        return {
+            "id": self.id,
+            "input_path": self.input_path,
+            "output_path": self.output_path,
+            "quality": self.quality,
+            "resolution": self.resolution,
+            "video_bitrate": self.video_bitrate,
+            "audio_bitrate": self.audio_bitrate,
+            "status": self.status.value,
+            "progress": self.progress,
+            "error_message": self.error_message,
+            "retry_count": self.retry_count,
+            "max_retries": self.max_retries,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "completed_at": (
+                self.completed_at.isoformat() if self.completed_at else None
+            ),
+            "estimated_duration": self.estimated_duration,
+        }
 
 
 class ResourceMonitor:
-    """Monitor system resources and manage limits"""
+    """Monitor system resources and manage limits
+
+    Once start() is called, a background thread refreshes a cached usage
+    snapshot every SAMPLE_INTERVAL seconds and get_system_usage() returns it
+    without touching psutil. Before that, each call takes a fresh reading.
+    """
+
+    # Seconds between background samples; CPU is averaged over this window.
+    SAMPLE_INTERVAL = 2.0
+    # CPU window for the first, blocking sample taken by start().
+    INITIAL_CPU_INTERVAL = 0.5
 
     def __init__(self, config):
         self.config = config
@@ -78,10 +165,17 @@ class ResourceMonitor:
         self.memory_threshold = config.resources.memory_limit_percent
         self.max_jobs = config.resources.max_concurrent_jobs
 
-    def get_system_usage(self) -> Dict[str, float]:
-        """Get current system resource usage"""
+        # Replaced wholesale by the sampler, so readers need no lock
+        self._usage_cache: Optional[Dict[str, float]] = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+        # Set while the latest sample is within limits; maintained by the sampler
+        self.resources_available = threading.Event()
+
+    def _sample(self, cpu_interval: Optional[float] = None) -> Dict[str, float]:
+        """Read current usage; ``cpu_interval=None`` measures CPU since the last call"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = psutil.cpu_percent(interval=cpu_interval)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage("/")
 
@@ -102,10 +196,64 @@ class ResourceMonitor:
                 "disk_free_gb": 0,
             }
 
+    def refresh(self) -> Dict[str, float]:
+        """Take a fresh sample and make it the cached snapshot"""
+        usage = self._sample()
+        self._publish(usage)
+        return usage
+
+    def _publish(self, usage: Dict[str, float]):
+        """Make ``usage`` the cached snapshot and update resources_available"""
+        self._usage_cache = usage
+        if self._usage_ok(usage):
+            self.resources_available.set()
+        else:
+            self.resources_available.clear()
+
+    def _sample_loop(self):
+        while not self._stop_sampling.wait(self.SAMPLE_INTERVAL):
+            self.refresh()
+
+    def start(self):
+        """Take an initial sample and start the background sampler (idempotent)"""
+        if self._sampler is not None:
+            return
+        self._publish(self._sample(cpu_interval=self.INITIAL_CPU_INTERVAL))
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(
+            target=self._sample_loop, name="ResourceSampler", daemon=True
+        )
+        self._sampler.start()
+
+    def stop(self):
+        """Stop the background sampler; later calls sample on demand again"""
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join(timeout=self.SAMPLE_INTERVAL + 1)
+            self._sampler = None
+        self._usage_cache = None
+        self.resources_available.clear()
+
+    def get_system_usage(self) -> Dict[str, float]:
+        """Get current system resource usage (the cached snapshot when sampling)"""
+        usage = self._usage_cache
+        if usage is not None:
+            return usage
+        return self._sample()
+
+    @property
+    def ok(self) -> bool:
+        """Whether a job may start, as of the latest background sample"""
+        if self._sampler is None:
+            return self.can_start_job()
+        return self.resources_available.is_set()
+
     def can_start_job(self) -> bool:
         """Check if a new job can be started based on resource limits"""
-        usage = self.get_system_usage()
+        return self._usage_ok(self.get_system_usage())
 
+    def _usage_ok(self, usage: Dict[str, float]) -> bool:
+        """Check a usage snapshot against the resource limits"""
         # Check CPU usage
         if usage["cpu_percent"] > self.cpu_threshold:
             logger.debug(f"CPU usage too high: {usage['cpu_percent']}%")
@@ -152,31 +300,88 @@ class ResourceMonitor:
 class JobQueue:
     """Thread-safe job queue with persistence and error recovery"""
 
+    # Connections kept open for job writes (workers plus status readers)
+    DB_POOL_SIZE = 4
+    # Seconds the DB writer waits to coalesce updates before each flush
+    WRITE_FLUSH_INTERVAL = 0.5
+    # Seconds a job rejected for lack of resources waits before it is re-queued
+    RESOURCE_RETRY_DELAY = 5.0
+    # Seconds before a failed job is retried
+    RETRY_DELAY = 30.0
+    # Seconds before a conversion is killed
+    CONVERSION_TIMEOUT = 3600
+    # Output lines kept for the error message of a failed conversion
+    OUTPUT_TAIL_LINES = 50
+
+    _UPSERT_JOB_SQL = """
+        INSERT OR REPLACE INTO jobs (
+            id, input_path, output_path, quality, resolution,
+            video_bitrate, audio_bitrate, status, progress,
+            error_message, retry_count, max_retries,
+            created_at, started_at, completed_at, estimated_duration
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
     def __init__(self, config, db_path: str):
         self.config = config
         self.db_path = db_path
         self.resource_monitor = ResourceMonitor(config)
+        # Parallel-jobs argument passed to the conversion script
+        self._parallel_jobs_arg = str(config.resources.max_concurrent_jobs)
+        # Reused connections instead of a connect/close per job update
+        self._db_pool = ConnectionPool(
+            db_path,
+            size=self.DB_POOL_SIZE,
+            pragmas=("PRAGMA temp_store=MEMORY", "PRAGMA mmap_size=134217728"),
+        )
 
         # Thread-safe queue
         self.job_queue = queue.Queue()
+        # Copy-on-write: writers swap in a new dict under self.lock, readers
+        # use whichever dict the attribute points to without locking
         self.running_jobs: Dict[str, ConversionJob] = {}
         self.completed_jobs: Dict[str, ConversionJob] = {}
+        # Conversion processes by job id, so cancel/shutdown can stop them
+        self._processes: Dict[str, subprocess.Popen] = {}
 
         # Threading
-        self.lock = threading.RLock()
+        self.lock = threading.Lock()
         self.worker_threads: List[threading.Thread] = []
         self.shutdown_event = threading.Event()
 
+        # Jobs waiting to be re-queued: heap of (ready_at, seq, job) on the
+        # monotonic clock, drained by the scheduler thread
+        self._deferred: List[tuple] = []
+        self._deferred_seq = itertools.count()
+        self._deferred_cond = threading.Condition()
+
+        # Job updates waiting for the DB writer, keyed by job id
+        self._pending_writes: Dict[str, ConversionJob] = {}
+        self._writes_cond = threading.Condition()
+
         # Initialize database
         self._init_database()
 
+        self._db_writer = threading.Thread(
+            target=self._db_writer_loop, name="JobDBWriter", daemon=True
+        )
+        self._db_writer.start()
+
+        # Sample resources in the background instead of on every check
+        self.resource_monitor.start()
+
+        self._scheduler = threading.Thread(
+            target=self._scheduler_loop, name="JobScheduler", daemon=True
+        )
+        self._scheduler.start()
+
         # Start worker threads
         self._start_workers()
 
     def _init_database(self):
         """Initialize job queue database"""
         try:
-            with get_db_connection(self.db_path) as conn:
+            with self._db_pool.connection() as conn:
                 execute_with_retry(
                     conn,
                     """
@@ -220,37 +425,68 @@ class JobQueue:
         logger.info(f"Started {worker_count} job worker threads")
 
     def _worker_loop(self):
-        """Main worker loop"""
-        while not self.shutdown_event.is_set():
+        """Main worker loop; blocks on the queue until a job or the shutdown sentinel arrives"""
+        while True:
+            job = self.job_queue.get()
             try:
-                # Wait for job or shutdown
-                try:
-                    job = self.job_queue.get(timeout=1)
-                except queue.Empty:
-                    continue
+                if job is _SHUTDOWN_SENTINEL:
+                    return
 
                 # Check if we can start the job
-                if not self.resource_monitor.can_start_job():
-                    # Put job back in queue and wait
-                    self.job_queue.put(job)
-                    time.sleep(5)
+                if not self.resource_monitor.ok:
+                    # Park the job; the scheduler re-queues it once resources free up
+                    self._defer_job(job, self.RESOURCE_RETRY_DELAY)
                     continue
 
                 # Process the job
                 self._process_job(job)
 
-                # Mark task as done
-                self.job_queue.task_done()
-
             except Exception as e:
                 logger.error(f"Worker thread error: {e}")
                 time.sleep(1)
+            finally:
+                # Mark task as done
+                self.job_queue.task_done()
+
+    def _defer_job(self, job: ConversionJob, delay: float):
+        """Hold a job out of the queue for at least ``delay`` seconds"""
+        with self._deferred_cond:
+            heapq.heappush(
+                self._deferred,
+                (time.monotonic() + delay, next(self._deferred_seq), job),
+            )
+            self._deferred_cond.notify()
+
+    def _scheduler_loop(self):
+        """Move due deferred jobs back onto the queue while resources allow"""
+        available = self.resource_monitor.resources_available
+        while not self.shutdown_event.is_set():
+            with self._deferred_cond:
+                if not self._deferred:
+                    self._deferred_cond.wait()
+                    continue
+                delay = self._deferred[0][0] - time.monotonic()
+                if delay > 0:
+                    self._deferred_cond.wait(delay)
+                    continue
+            if not self.resource_monitor.ok:
+                # Sleep until the sampler reports headroom again
+                available.wait(self.RESOURCE_RETRY_DELAY)
+                continue
+            with self._deferred_cond:
+                now = time.monotonic()
+                while self._deferred and self._deferred[0][0] <= now:
+                    self.job_queue.put(heapq.heappop(self._deferred)[2])
 
     def _process_job(self, job: ConversionJob):
         """Process a single conversion job"""
         try:
-            # Update job status
-            job.status = JobStatus.RUNNING
+            # Update job status, unless it was cancelled while still queued
+            with self.lock:
+                if job.status is JobStatus.CANCELLED:
+                    logger.info(f"Skipping cancelled job {job.id}")
+                    return
+                job.status = JobStatus.RUNNING
             job.started_at = datetime.utcnow()
             self._update_job_in_db(job)
 
@@ -259,7 +495,18 @@ class JobQueue:
             # Run conversion
             success = self._run_conversion(job)
 
-            if success:
+            # A terminate from cancel_job or shutdown is not a failed attempt
+            with self.lock:
+                cancelled = job.status is JobStatus.CANCELLED
+                interrupted = not success and self.shutdown_event.is_set()
+
+            if cancelled:
+                logger.info(f"Job {job.id} stopped after cancellation")
+            elif interrupted:
+                # Left pending so the next start picks it up again
+                job.status = JobStatus.PENDING
+                logger.info(f"Job {job.id} interrupted by shutdown")
+            elif success:
                 job.status = JobStatus.COMPLETED
                 job.progress = 100.0
                 job.completed_at = datetime.utcnow()
@@ -273,9 +520,8 @@ class JobQueue:
                         f"Job {job.id} failed, retrying ({job.retry_count}/{job.max_retries})"
                     )
 
-                    # Put back in queue for retry
-                    time.sleep(30)  # Wait before retry
-                    self.job_queue.put(job)
+                    # Re-queued by the scheduler after the retry delay
+                    self._defer_job(job, self.RETRY_DELAY)
                 else:
                     job.status = JobStatus.FAILED
                     logger.error(f"Job {job.id} failed after {job.max_retries} retries")
@@ -285,9 +531,10 @@ class JobQueue:
 
             # Move to completed jobs
             with self.lock:
-                if job.id in self.running_jobs:
-                    del self.running_jobs[job.id]
-                self.completed_jobs[job.id] = job
+                running = dict(self.running_jobs)
+                running.pop(job.id, None)
+                self.running_jobs = running
+                self.completed_jobs = {**self.completed_jobs, job.id: job}
 
         except Exception as e:
             logger.error(f"Error processing job {job.id}: {e}")
@@ -298,39 +545,78 @@ class JobQueue:
     def _run_conversion(self, job: ConversionJob) -> bool:
         """Run the actual HandBrake conversion"""
         try:
-            # Execute handbrake2resilio.sh via subprocess
-            script_path = "/app/handbrake2resilio.sh"
-
             # Ensure output directory exists
             os.makedirs(os.path.dirname(job.output_path), exist_ok=True)
 
-            # Build command with proper arguments
+            # Execute handbrake2resilio.sh via subprocess
             cmd = [
-                script_path,
+                CONVERSION_SCRIPT,
                 job.input_path,
                 job.output_path,
-                str(self.config.resources.max_concurrent_jobs),  # parallel jobs
+                self._parallel_jobs_arg,
             ]
 
             logger.info(f"Starting conversion for job {job.id}: {' '.join(cmd)}")
 
-            # Run conversion with timeout (1 hour)
-            result = subprocess.run(
-                cmd, capture_output=True, text=True, timeout=3600, cwd="/app"
+            # Stream output instead of buffering it all; text mode splits on
+            # the \r HandBrake ends progress updates with
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+                cwd="/app",
+                # Own process group, so HandBrakeCLI started by the script is
+                # stopped along with it
+                start_new_session=True,
             )
-
-            if result.returncode == 0:
+            with self.lock:
+                self._processes[job.id] = process
+                # cancel_job found no process to signal if it ran before the
+                # registration above; stop the conversion here instead
+                if job.status is JobStatus.CANCELLED:
+                    _signal_process_group(process, signal.SIGTERM)
+            timed_out = threading.Event()
+
+            def _kill():
+                timed_out.set()
+                _signal_process_group(process, signal.SIGKILL)
+
+            timer = threading.Timer(self.CONVERSION_TIMEOUT, _kill)
+            timer.daemon = True
+            timer.start()
+
+            tail = deque(maxlen=self.OUTPUT_TAIL_LINES)
+            try:
+                for line in process.stdout:
+                    tail.append(line)
+                    match = _PROGRESS_RE.search(line)
+                    if match:
+                        progress = float(match.group(1))
+                        if progress != job.progress:
+                            self._update_job_progress(job, progress)
+                returncode = process.wait()
+            finally:
+                timer.cancel()
+                process.stdout.close()
+                with self.lock:
+                    self._processes.pop(job.id, None)
+
+            if returncode == 0:
                 logger.info(f"Conversion successful for job {job.id}")
                 return True
+            elif timed_out.is_set():
+                logger.error(f"Conversion timeout for job {job.id}")
+                job.error_message = "Conversion timed out after 1 hour"
+                return False
             else:
-                logger.error(f"Conversion failed for job {job.id}: {result.stderr}")
-                job.error_message = result.stderr
+                output = "".join(tail)
+                logger.error(f"Conversion failed for job {job.id}: {output}")
+                job.error_message = output
                 return False
 
-        except subprocess.TimeoutExpired:
-            logger.error(f"Conversion timeout for job {job.id}")
-            job.error_message = "Conversion timed out after 1 hour"
-            return False
         except Exception as e:
             logger.error(f"Conversion failed for job {job.id}: {e}")
             job.error_message = str(e)
@@ -341,42 +627,64 @@ class JobQueue:
         job.progress = progress
         self._update_job_in_db(job)
 
+    @staticmethod
+    def _job_row(job: ConversionJob) -> tuple:
+        """Snapshot a job as the parameter tuple for _UPSERT_JOB_SQL"""
+        return (
+            job.id,
+            job.input_path,
+            job.output_path,
+            job.quality,
+            job.resolution,
+            job.video_bitrate,
+            job.audio_bitrate,
+            job.status.value,
+            job.progress,
+            job.error_message,
+            job.retry_count,
+            job.max_retries,
+            job.created_at.isoformat() if job.created_at else None,
+            job.started_at.isoformat() if job.started_at else None,
+            job.completed_at.isoformat() if job.completed_at else None,
+            job.estimated_duration,
+        )
+
     def _update_job_in_db(self, job: ConversionJob):
-        """Update job in database"""
+        """Queue the job for the DB writer (latest state wins)
+
+        The row, including its timestamp strings, is built once at flush time
+        rather than for every coalesced progress update.
+        """
+        with self._writes_cond:
+            self._pending_writes[job.id] = job
+            self._writes_cond.notify()
+
+    def flush_writes(self):
+        """Write every pending job update in one transaction"""
+        with self._writes_cond:
+            if not self._pending_writes:
+                return
+            jobs, self._pending_writes = list(self._pending_writes.values()), {}
+        rows = [self._job_row(job) for job in jobs]
         try:
-            with get_db_connection(self.db_path) as conn:
-                execute_with_retry(
-                    conn,
-                    """
-                    INSERT OR REPLACE INTO jobs (
-                        id, input_path, output_path, quality, resolution,
-                        video_bitrate, audio_bitrate, status, progress,
-                        error_message, retry_count, max_retries,
-                        created_at, started_at, completed_at, estimated_duration
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        job.id,
-                        job.input_path,
-                        job.output_path,
-                        job.quality,
-                        job.resolution,
-                        job.video_bitrate,
-                        job.audio_bitrate,
-                        job.status.value,
-                        job.progress,
-                        job.error_message,
-                        job.retry_count,
-                        job.max_retries,
-                        job.created_at.isoformat() if job.created_at else None,
-                        job.started_at.isoformat() if job.started_at else None,
-                        job.completed_at.isoformat() if job.completed_at else None,
-                        job.estimated_duration,
-                    ),
-                )
+            with self._db_pool.connection() as conn:
+                # One prepared statement bound once per row
+                executemany_with_retry(conn, self._UPSERT_JOB_SQL, rows)
                 commit_with_retry(conn)
         except Exception as e:
-            logger.error(f"Failed to update job in database: {e}")
+            logger.error(f"Failed to write {len(rows)} job updates to database: {e}")
+
+    def _db_writer_loop(self):
+        """Flush coalesced job updates at most once per WRITE_FLUSH_INTERVAL"""
+        while True:
+            with self._writes_cond:
+                while not self._pending_writes and not self.shutdown_event.is_set():
+                    self._writes_cond.wait()
+            if self.shutdown_event.is_set():
+                return
+            # Let further updates to the same jobs collapse into this flush
+            self.shutdown_event.wait(self.WRITE_FLUSH_INTERVAL)
+            self.flush_writes()
 
     def add_job(self, job: ConversionJob) -> bool:
         """Add a new job to the queue"""
@@ -389,7 +697,7 @@ class JobQueue:
 
                 # Add to queue
                 self.job_queue.put(job)
-                self.running_jobs[job.id] = job
+                self.running_jobs = {**self.running_jobs, job.id: job}
 
                 # Save to database
                 self._update_job_in_db(job)
@@ -410,8 +718,14 @@ class JobQueue:
                     job.status = JobStatus.CANCELLED
                     self._update_job_in_db(job)
 
+                    process = self._processes.get(job_id)
+                    if process is not None:
+                        _signal_process_group(process, signal.SIGTERM)
+
                     # Remove from running jobs
-                    del self.running_jobs[job_id]
+                    running = dict(self.running_jobs)
+                    del running[job_id]
+                    self.running_jobs = running
 
                     logger.info(f"Cancelled job {job_id}")
                     return True
@@ -425,37 +739,54 @@ class JobQueue:
 
     def get_job_status(self, job_id: str) -> Optional[ConversionJob]:
         """Get job status"""
-        with self.lock:
-            if job_id in self.running_jobs:
-                return self.running_jobs[job_id]
-            elif job_id in self.completed_jobs:
-                return self.completed_jobs[job_id]
-            else:
-                return None
+        job = self.running_jobs.get(job_id)
+        if job is None:
+            job = self.completed_jobs.get(job_id)
+        return job
 
     def get_queue_status(self) -> Dict[str, Any]:
         """Get overall queue status"""
         usage = self.resource_monitor.get_system_usage()
 
-        with self.lock:
-            return {
-                "queue_size": self.job_queue.qsize(),
-                "running_jobs": len(self.running_jobs),
-                "completed_jobs": len(self.completed_jobs),
-                "system_usage": usage,
-                "can_start_job": self.resource_monitor.can_start_job(),
-                "optimal_job_count": self.resource_monitor.get_optimal_job_count(),
-            }
+        return {
+            "queue_size": self.job_queue.qsize(),
+            "deferred_jobs": len(self._deferred),
+            "running_jobs": len(self.running_jobs),
+            "completed_jobs": len(self.completed_jobs),
+            "system_usage": usage,
+            "can_start_job": self.resource_monitor.can_start_job(),
+            "optimal_job_count": self.resource_monitor.get_optimal_job_count(),
+        }
 
     def shutdown(self):
         """Shutdown the job queue"""
         logger.info("Shutting down job queue...")
         self.shutdown_event.set()
 
-        # Wait for workers to finish
+        # Stop running conversions so their workers can exit
+        with self.lock:
+            for process in self._processes.values():
+                _signal_process_group(process, signal.SIGTERM)
+
+        # Wake each idle worker with a sentinel, then wait for workers to finish
+        for _ in self.worker_threads:
+            self.job_queue.put(_SHUTDOWN_SENTINEL)
         for worker in self.worker_threads:
             worker.join(timeout=5)
 
+        with self._deferred_cond:
+            self._deferred_cond.notify_all()
+        self._scheduler.join(timeout=5)
+
+        # Stop the DB writer and persist whatever it had not flushed yet
+        with self._writes_cond:
+            self._writes_cond.notify_all()
+        self._db_writer.join(timeout=5)
+        self.flush_writes()
+
+        self.resource_monitor.stop()
+        self._db_pool.close()
+
         logger.info("Job queue shutdown complete")
 
 
@@ -0,0 +1,77 @@
+"""orjson-backed JSON helpers shared by the Flask services."""
+
+from __future__ import annotations
+
+import decimal
+from typing import Any
+
+import orjson
+from flask import current_app
+from flask.json.provider import JSONProvider
+
+# Job/tab payloads occasionally carry integer keys (stdlib json allows them).
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(obj: Any) -> Any:
+    """Serialize the few types orjson does not handle natively."""
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, "__html__"):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize *obj* straight to UTF-8 JSON bytes."""
+    return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+
+def orjson_response(obj: Any, status: int = 200):
+    """Build a JSON response for *obj* without going through ``jsonify``.
+
+    Skips jsonify's argument handling and the provider lookup; use it on
+    endpoints that return one large payload.
+    """
+    return current_app.response_class(
+        dumps_bytes(obj), status=status, mimetype="application/json"
+    )
+
+
+class SocketIOJSON:
+    """Stand-in for the ``json`` module, for ``SocketIO(json=SocketIOJSON)``.
+
+    python-socketio and python-engineio call ``dumps``/``loads`` with stdlib
+    keyword arguments such as ``separators``; orjson output is already compact,
+    so they are ignored.
+    """
+
+    @staticmethod
+    def dumps(obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode("utf-8")
+
+    @staticmethod
+    def loads(s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider that encodes with orjson.
+
+    ``jsonify`` responses are built from the encoded bytes directly, skipping
+    the str round trip the default provider does.
+    """
+
+    mimetype = "application/json"
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(dumps_bytes(obj), mimetype=self.mimetype)
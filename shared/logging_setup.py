@@ -0,0 +1,185 @@
+"""Shared logging setup: structlog with orjson rendering and a queued stderr sink."""
+
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Iterable, MutableMapping, Optional, TextIO
+
+import orjson
+import structlog
+
+# Size of the stderr write buffer used by the queue listener.
+_STDERR_BUFFER_BYTES = 64 * 1024
+
+_listener: Optional[QueueListener] = None
+
+
+def _format_exc_info(
+    logger: Any, method_name: str, event_dict: MutableMapping[str, Any]
+) -> MutableMapping[str, Any]:
+    """Render exc_info only when present; most log calls carry none."""
+    if "exc_info" in event_dict:
+        return structlog.processors.format_exc_info(logger, method_name, event_dict)
+    return event_dict
+
+
+def _render_json(
+    logger: Any, method_name: str, event_dict: MutableMapping[str, Any]
+) -> str:
+    """Render the event dict as one JSON line with orjson."""
+    return orjson.dumps(event_dict, default=str).decode("utf-8")
+
+
+def log_level_from_env(default: str = "INFO") -> int:
+    """Return the numeric level named by ``LOG_LEVEL`` (falls back to *default*)."""
+    name = os.getenv("LOG_LEVEL", default).upper()
+    return getattr(logging, name, logging.INFO)
+
+
+def configure_structlog(level: int | None = None) -> None:
+    """Configure structlog for a service process.
+
+    Level filtering happens in the bound logger itself, so calls below *level*
+    cost a no-op method call instead of running the processor chain.
+
+    Args:
+        level: Minimum level to emit; defaults to ``LOG_LEVEL`` from the environment.
+    """
+    if level is None:
+        level = log_level_from_env()
+    structlog.configure(
+        processors=[
+            structlog.stdlib.add_logger_name,
+            structlog.stdlib.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            _format_exc_info,
+            _render_json,
+        ],
+        context_class=dict,
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.make_filtering_bound_logger(level),
+        cache_logger_on_first_use=True,
+    )
+
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that batches writes instead of flushing every record.
+
+    The buffer is flushed once the log queue has drained, or under sustained
+    load once FLUSH_BYTES are pending or FLUSH_INTERVAL has passed, so a
+    lone record is still written out immediately.
+    """
+
+    FLUSH_BYTES = 4096
+    FLUSH_INTERVAL = 0.05  # seconds
+
+    def __init__(self, stream: TextIO, log_queue: "queue.SimpleQueue[Any]") -> None:
+        super().__init__(stream)
+        self._log_queue = log_queue
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self.format(record) + self.terminator
+            self.stream.write(line)
+            self._pending_bytes += len(line)
+            now = time.monotonic()
+            if (
+                self._log_queue.empty()
+                or self._pending_bytes >= self.FLUSH_BYTES
+                or now - self._last_flush >= self.FLUSH_INTERVAL
+            ):
+                self.flush()
+                self._pending_bytes = 0
+                self._last_flush = now
+        except Exception:
+            self.handleError(record)
+
+
+class AccessLogPathFilter(logging.Filter):
+    """Drop Werkzeug access-log records for the given request paths.
+
+    Werkzeug logs ``'"%s" %s %s'`` with the request line ("GET /path HTTP/1.1")
+    as the first argument; the path is matched without its query string.
+    """
+
+    def __init__(self, paths: Iterable[str] = (), prefixes: Iterable[str] = ()) -> None:
+        super().__init__()
+        self._paths = frozenset(paths)
+        self._prefixes = tuple(prefixes)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        args = record.args
+        if not isinstance(args, tuple) or not args or not isinstance(args[0], str):
+            return True
+        parts = args[0].split(" ", 2)
+        if len(parts) < 2:
+            return True
+        path = parts[1].partition("?")[0]
+        return not (path in self._paths or path.startswith(self._prefixes))
+
+
+def quiet_access_log(paths: Iterable[str] = (), prefixes: Iterable[str] = ()) -> None:
+    """Skip Werkzeug access-log lines for high-frequency paths (health probes, polling)."""
+    logging.getLogger("werkzeug").addFilter(AccessLogPathFilter(paths, prefixes))
+
+
+def _open_buffered_stderr() -> TextIO:
+    """Return a block-buffered text stream on a duplicate of the stderr fd."""
+    try:
+        fd = os.dup(sys.stderr.fileno())
+    except (AttributeError, OSError, ValueError):
+        # stderr replaced by an object without a real file descriptor
+        return sys.stderr
+    return open(
+        fd,
+        "w",
+        buffering=_STDERR_BUFFER_BYTES,
+        encoding="utf-8",
+        errors="backslashreplace",
+    )
+
+
+def _stop_listener() -> None:
+    """Drain pending records and flush the buffered stream at interpreter exit."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+def configure_queue_logging(level: Optional[int] = None) -> None:
+    """Route stdlib logging (and so structlog output) through a background writer.
+
+    Request threads only enqueue records; a single QueueListener thread writes
+    them to a buffered stderr. Safe to call more than once per process.
+
+    Args:
+        level: Root logger level; defaults to ``LOG_LEVEL`` from the environment.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    if level is None:
+        level = log_level_from_env()
+
+    log_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+    handler = _BufferedStreamHandler(_open_buffered_stderr(), log_queue)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    root = logging.getLogger()
+    root.addHandler(QueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.register(_stop_listener)
@@ -14,6 +14,7 @@ sys.path.insert(0, _ROOT)
 from shared.db import (  # noqa: E402
     commit_with_retry,
     execute_with_retry,
+    executemany_with_retry,
     get_db_connection,
 )
 
@@ -113,5 +114,25 @@ class TestExecuteWithRetry(unittest.TestCase):
         conn.execute.assert_called_once()
 
 
+class TestExecutemanyWithRetry(unittest.TestCase):
+    """Tests for executemany_with_retry."""
+
+    @patch("shared.db.time.sleep", return_value=None)
+    def test_retry_replays_all_rows(self, _sleep: MagicMock) -> None:
+        conn = MagicMock()
+        seen: list = []
+
+        def flaky_executemany(_sql: str, rows: list) -> MagicMock:
+            seen.append(list(rows))
+            if len(seen) < 2:
+                raise sqlite3.OperationalError("database is locked")
+            return MagicMock()
+
+        conn.executemany.side_effect = flaky_executemany
+
+        executemany_with_retry(conn, "INSERT INTO t VALUES (?)", ((i,) for i in range(3)))
+        self.assertEqual(seen, [[(0,), (1,), (2,)], [(0,), (1,), (2,)]])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -298,6 +298,8 @@ class TestJobQueue(unittest.TestCase):
         mock_memory.return_value = MagicMock(percent=85.0, available=1 * 1024**3)
         mock_disk.return_value = MagicMock(percent=80.0, free=3 * 1024**3)
 
+        # The queue's monitor serves a cached snapshot; resample under the mocks
+        self.job_queue.resource_monitor.refresh()
         can_start = self.job_queue.resource_monitor.can_start_job()
 
         self.assertFalse(can_start)
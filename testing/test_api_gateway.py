@@ -1,8 +1,12 @@
 """Unit tests for api-gateway/api_gateway_simple.py."""
 from __future__ import annotations
 
+import io
+import json
 import os
 import sys
+import time
+from datetime import datetime, timedelta
 from unittest.mock import patch
 
 import pytest
@@ -42,6 +46,137 @@ class TestHealthEndpoint:
         assert "timestamp" in data
         assert "database" in data
 
+    @patch("api_gateway_simple.get_handbrake_service_status", return_value=None)
+    def test_health_is_cached_unless_deep(self, mock_status, api_client) -> None:
+        """Repeated probes reuse the cached check; ?deep=1 probes again."""
+        api_client.get("/health")
+        api_client.get("/health")
+        assert mock_status.call_count == 1
+        assert api_client.get("/health?deep=1").status_code == 200
+        assert mock_status.call_count == 2
+
+
+class TestHandBrakeStatusCache:
+    """Tests for the TTL cache around the HandBrake /health probe."""
+
+    def test_status_is_cached_between_calls(self, api_client) -> None:
+        """Back-to-back status checks hit the HandBrake service once."""
+        gw = sys.modules["api_gateway_simple"]
+        with patch.object(gw._hb_session, "get") as mock_get:
+            mock_get.return_value.status_code = 200
+            mock_get.return_value.json.return_value = {"status": "healthy"}
+            assert gw.get_handbrake_service_status() == {"status": "healthy"}
+            assert gw.get_handbrake_service_status() == {"status": "healthy"}
+        assert mock_get.call_count == 1
+
+    def test_not_modified_reuses_previous_status(self, api_client) -> None:
+        """A 304 from HandBrake keeps the previously fetched status."""
+        gw = sys.modules["api_gateway_simple"]
+        gw._hb_status_cache.update(
+            checked_at=0.0, value={"status": "healthy"}, etag='W/"abc"'
+        )
+        with patch.object(gw._hb_session, "get") as mock_get:
+            mock_get.return_value.status_code = 304
+            assert gw.get_handbrake_service_status() == {"status": "healthy"}
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": 'W/"abc"'}
+
+
+class TestBroadcastCoalescing:
+    """Tests for the latest-only realtime broadcast slots."""
+
+    def test_newer_payload_replaces_unsent_one(self, api_client) -> None:
+        """Queuing the same event twice keeps only the latest payload."""
+        gw = sys.modules["api_gateway_simple"]
+        gw._queue_broadcast("system_update", {"tick": 1})
+        gw._queue_broadcast("system_update", {"tick": 2})
+        gw._queue_broadcast("queue_update", {"jobs": []})
+        assert gw._pending_broadcasts == {
+            "system_update": {"tick": 2},
+            "queue_update": {"jobs": []},
+        }
+
+    def test_unchanged_payload_is_not_requeued(self, api_client) -> None:
+        """A payload differing only in volatile keys is skipped."""
+        gw = sys.modules["api_gateway_simple"]
+        gw._last_broadcast_digests.clear()
+        first = {"cpu": 1, "timestamp": "a"}
+        volatile = ("timestamp",)
+        assert gw._queue_broadcast_if_changed("system_update", first, volatile)
+        gw._pending_broadcasts.clear()
+        same = {"cpu": 1, "timestamp": "b"}
+        assert not gw._queue_broadcast_if_changed("system_update", same, volatile)
+        assert gw._pending_broadcasts == {}
+        changed = {"cpu": 2, "timestamp": "c"}
+        assert gw._queue_broadcast_if_changed("system_update", changed, volatile)
+
+    def test_writer_emits_to_local_clients_only(self, api_client) -> None:
+        """Realtime broadcasts bypass the message queue; each worker sends its own."""
+        gw = sys.modules["api_gateway_simple"]
+        gw._queue_broadcast("system_update", {"tick": 1})
+        # SystemExit is not caught by the writer, so it stops after one emit
+        with patch.object(gw.socketio, "emit", side_effect=SystemExit) as mock_emit:
+            with pytest.raises(SystemExit):
+                gw._broadcast_writer()
+        mock_emit.assert_called_once_with(
+            "system_update", {"tick": 1}, to=gw.BROADCAST_ROOM, ignore_queue=True
+        )
+
+
+class TestSocketUserRooms:
+    """Tests for per-user Socket.IO rooms."""
+
+    def test_tab_change_notifies_only_owner(
+        self, api_client, auth_token, auth_headers
+    ) -> None:
+        """tabs_changed reaches the authenticated client, not anonymous ones."""
+        gw = sys.modules["api_gateway_simple"]
+        owner = gw.socketio.test_client(gw.app, auth={"token": auth_token})
+        anonymous = gw.socketio.test_client(gw.app)
+        owner.get_received()
+        anonymous.get_received()
+
+        resp = api_client.post("/api/tabs", headers=auth_headers, json={"name": "Room Tab"})
+        assert resp.status_code == 200
+
+        assert [m["name"] for m in owner.get_received()] == ["tabs_changed"]
+        assert anonymous.get_received() == []
+        owner.disconnect()
+        anonymous.disconnect()
+
+    def test_broadcasts_reach_broadcast_room_members(self, api_client) -> None:
+        """Realtime broadcasts go to the broadcast room, which clients can leave."""
+        gw = sys.modules["api_gateway_simple"]
+        member = gw.socketio.test_client(gw.app)
+        leaver = gw.socketio.test_client(gw.app)
+        leaver.emit("leave_room", {"room": gw.BROADCAST_ROOM})
+        member.get_received()
+        leaver.get_received()
+
+        gw.socketio.emit("system_update", {"tick": 1}, to=gw.BROADCAST_ROOM)
+
+        assert [m["name"] for m in member.get_received()] == ["system_update"]
+        assert leaver.get_received() == []
+        member.disconnect()
+        leaver.disconnect()
+
+
+class TestClientLogEndpoints:
+    """Tests for /api/log-error and /api/log-info."""
+
+    def test_client_error_is_queued_and_drained(self, api_client) -> None:
+        """Client errors are queued and written out as one JSON line each."""
+        gw = sys.modules["api_gateway_simple"]
+        gw._client_log_queue.clear()
+        resp = api_client.post("/api/log-error", json={"error": "boom"})
+        assert resp.status_code == 200
+        assert len(gw._client_log_queue) == 1
+
+        out = io.BytesIO()
+        gw._drain_client_logs(out)
+        line = json.loads(out.getvalue().splitlines()[0])
+        assert line["error_message"] == "boom"
+        assert not gw._client_log_queue
+
 
 class TestAuthEndpoints:
     """Tests for /api/auth/* endpoints."""
@@ -66,6 +201,13 @@ class TestAuthEndpoints:
         resp = api_client.post("/api/auth/login", json={})
         assert resp.status_code == 400
 
+    def test_login_non_json_body_returns_400(self, api_client) -> None:
+        """POST /api/auth/login with a non-JSON body returns 400, not 500."""
+        resp = api_client.post(
+            "/api/auth/login", data="not json", content_type="text/plain"
+        )
+        assert resp.status_code == 400
+
     def test_register_new_user(self, api_client) -> None:
         """POST /api/auth/register with new user returns 200."""
         resp = api_client.post(
@@ -176,6 +318,77 @@ class TestTabEndpoints:
         resp = api_client.delete(f"/api/tabs/{tab_id}", headers=auth_headers)
         assert resp.status_code == 200
 
+    def test_get_tabs_etag_not_modified(self, api_client, auth_headers) -> None:
+        """GET /api/tabs returns 304 for a matching ETag until a tab changes."""
+        first = api_client.get("/api/tabs", headers=auth_headers)
+        etag = first.headers["ETag"]
+        conditional = {**auth_headers, "If-None-Match": etag}
+
+        again = api_client.get("/api/tabs", headers=conditional)
+        assert again.status_code == 304
+
+        api_client.post(
+            "/api/tabs",
+            headers=auth_headers,
+            json={"name": "ETag", "source_path": "/a", "destination_path": "/b"},
+        )
+        changed = api_client.get("/api/tabs", headers=conditional)
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+
+    def test_get_tabs_etag_follows_other_connections(
+        self, api_client, auth_headers
+    ) -> None:
+        """A tab written by another connection (e.g. another worker) changes the ETag."""
+        import sqlite3
+
+        gw = sys.modules["api_gateway_simple"]
+        first = api_client.get("/api/tabs", headers=auth_headers)
+        etag = first.headers["ETag"]
+        user_id = gw.auth_service.verify_token(
+            auth_headers["Authorization"].split()[1]
+        )["id"]
+        conn = sqlite3.connect(gw.auth_service.db_path)
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT INTO tabs (name, source_path, destination_path, user_id)"
+                    " VALUES ('Other worker', '/a', '/b', ?)",
+                    (user_id,),
+                )
+        finally:
+            conn.close()
+        conditional = {**auth_headers, "If-None-Match": etag}
+        changed = api_client.get("/api/tabs", headers=conditional)
+        assert changed.status_code == 200
+        assert changed.headers["ETag"] != etag
+        assert "Other worker" in [t["name"] for t in changed.get_json()["data"]]
+
+    def test_bulk_create_tabs(self, api_client, auth_headers) -> None:
+        """POST /api/tabs/bulk creates valid rows and reports per-row errors."""
+        resp = api_client.post(
+            "/api/tabs/bulk",
+            headers=auth_headers,
+            json=[
+                {"name": "Movies", "source_path": "/in/m", "destination_path": "/out/m"},
+                {"name": 42},
+                {"name": "TV", "source_path": "/in/tv", "destination_path": "/out/tv"},
+            ],
+        )
+        assert resp.status_code == 200
+        results = resp.get_json()["data"]
+        assert [r["error"] is None for r in results] == [True, False, True]
+        assert results[1]["id"] is None
+
+        tabs = api_client.get("/api/tabs", headers=auth_headers).get_json()["data"]
+        ids = {t["id"] for t in tabs}
+        assert results[0]["id"] in ids and results[2]["id"] in ids
+
+    def test_bulk_create_tabs_rejects_non_array(self, api_client, auth_headers) -> None:
+        """POST /api/tabs/bulk with a non-array body returns 400."""
+        resp = api_client.post("/api/tabs/bulk", headers=auth_headers, json={"name": "x"})
+        assert resp.status_code == 400
+
 
 class TestQueueEndpoints:
     """Tests for /api/queue/* endpoints."""
@@ -200,11 +413,74 @@ class TestQueueEndpoints:
         assert "jobs" in data
         assert "count" in data
 
+    @patch("api_gateway_simple.forward_to_handbrake_service", return_value=True)
+    def test_list_jobs_reflects_new_writes(self, _mock_fwd, api_client) -> None:
+        """The cached jobs listing is refreshed after a job is written."""
+        assert api_client.get("/api/jobs/list").get_json()["count"] == 0
+        api_client.post(
+            "/api/jobs/add",
+            json={"input_path": "/in/snap.mp4", "output_path": "/out/snap.mkv"},
+        )
+        assert api_client.get("/api/jobs/list").get_json()["count"] == 1
+
+    @patch("api_gateway_simple.forward_to_handbrake_service", return_value=True)
+    def test_queue_counts_follow_jobs_snapshot(self, _mock_fwd, api_client) -> None:
+        """/api/queue counts come from the current jobs snapshot and track writes."""
+        gw = sys.modules["api_gateway_simple"]
+        api_client.post(
+            "/api/jobs/add",
+            json={"input_path": "/in/c.mp4", "output_path": "/out/c.mkv"},
+        )
+        api_client.get("/api/jobs/list")
+        with patch.object(gw, "_db_pool", wraps=gw._db_pool) as pool:
+            data = api_client.get("/api/queue").get_json()["data"]
+        assert data["total"] == 1
+        assert pool.connection.call_count == 0
+        api_client.post(
+            "/api/jobs/add",
+            json={"input_path": "/in/d.mp4", "output_path": "/out/d.mkv"},
+        )
+        assert api_client.get("/api/queue").get_json()["data"]["total"] == 2
+
+    @patch("api_gateway_simple.forward_to_handbrake_service", return_value=True)
+    def test_list_jobs_paginates(self, _mock_fwd, api_client) -> None:
+        """?limit=&offset= returns one page plus the total."""
+        for i in range(3):
+            api_client.post(
+                "/api/jobs/add",
+                json={"input_path": f"/in/p{i}.mp4", "output_path": f"/out/p{i}.mkv"},
+            )
+        data = api_client.get("/api/jobs/list?limit=2&offset=2").get_json()
+        assert data["count"] == 1
+        assert data["total"] == 3
+        assert len(data["jobs"]) == 1
+
+    @patch("api_gateway_simple.forward_to_handbrake_service", return_value=True)
+    def test_queue_jobs_page_reads_only_the_page(self, _mock_fwd, api_client) -> None:
+        """?limit= on /api/queue/jobs without a current snapshot queries one page."""
+        for i in range(3):
+            api_client.post(
+                "/api/jobs/add",
+                json={"input_path": f"/in/q{i}.mp4", "output_path": f"/out/q{i}.mkv"},
+            )
+        body = api_client.get("/api/queue/jobs?limit=2").get_json()
+        assert len(body["data"]) == 2
+        assert body["total"] == 3
+        assert body["offset"] == 0
+
     def test_get_nonexistent_job_status(self, api_client) -> None:
         """GET /api/jobs/status/<id> for unknown job returns 404."""
         resp = api_client.get("/api/jobs/status/nonexistent-job-id")
         assert resp.status_code == 404
 
+    def test_handbrake_event_wakes_realtime_loop(self, api_client) -> None:
+        """POST /api/handbrake/event marks jobs dirty for the next broadcast."""
+        gw = sys.modules["api_gateway_simple"]
+        gw._jobs_dirty.clear()
+        resp = api_client.post("/api/handbrake/event")
+        assert resp.status_code == 204
+        assert gw._jobs_dirty.is_set()
+
     def test_clear_completed_jobs(self, api_client) -> None:
         """POST /api/queue/clear returns 200."""
         resp = api_client.post("/api/queue/clear")
@@ -239,6 +515,65 @@ class TestJobEndpoints:
         body = resp.get_json()
         assert "job_id" in body
 
+    @patch("api_gateway_simple.forward_to_handbrake_service")
+    def test_add_job_invalid_quality_returns_400(self, mock_fwd, api_client) -> None:
+        """POST /api/jobs/add with a non-numeric quality is rejected before forwarding."""
+        resp = api_client.post(
+            "/api/jobs/add",
+            json={"input_path": "/in/q.mp4", "quality": "high"},
+        )
+        assert resp.status_code == 400
+        mock_fwd.assert_not_called()
+
+    @patch("api_gateway_simple.forward_to_handbrake_service")
+    def test_add_jobs_bulk(self, mock_fwd, api_client) -> None:
+        """POST /api/jobs/add_bulk saves valid rows and forwards them in one call."""
+        mock_fwd.side_effect = lambda endpoint, payload, method: {
+            "results": [
+                {"job_id": payload[1]["job_id"], "error": "Invalid input_path"}
+            ]
+        }
+        resp = api_client.post(
+            "/api/jobs/add_bulk",
+            json=[
+                {"input_path": "/in/1.mp4"},
+                {"output_path": "/out/missing-input.mkv"},
+                {"input_path": "/in/2.mp4"},
+            ],
+        )
+        assert resp.status_code == 200
+        body = resp.get_json()
+        assert body["count"] == 2
+        assert body["results"][1]["error"] == "input_path is required"
+        assert body["results"][2]["error"] == "Invalid input_path"
+        assert mock_fwd.call_count == 1
+        assert mock_fwd.call_args[0][0] == "/convert/bulk"
+        assert len(mock_fwd.call_args[0][1]) == 2
+        listed = api_client.get("/api/jobs/list").get_json()
+        assert listed["count"] == 2
+
+    @patch("api_gateway_simple.forward_to_handbrake_service")
+    def test_add_jobs_bulk_partially_admitted(self, mock_fwd, api_client) -> None:
+        """Rows HandBrake could not start are reported per row as overloaded."""
+        mock_fwd.side_effect = lambda endpoint, payload, method: {
+            "results": [
+                {"job_id": payload[0]["job_id"], "error": None},
+                {
+                    "job_id": payload[1]["job_id"],
+                    "error": "System resources are currently at capacity",
+                },
+            ],
+            "count": 1,
+        }
+        resp = api_client.post(
+            "/api/jobs/add_bulk",
+            json=[{"input_path": "/in/p1.mp4"}, {"input_path": "/in/p2.mp4"}],
+        )
+        assert resp.status_code == 200
+        results = resp.get_json()["results"]
+        assert results[0]["error"] is None
+        assert results[1]["error"] == "System resources are currently at capacity"
+
     @patch("api_gateway_simple.forward_to_handbrake_service")
     def test_job_status_after_add(self, mock_fwd, api_client) -> None:
         """GET /api/jobs/status/:id returns the job created via add."""
@@ -264,6 +599,30 @@ class TestJobEndpoints:
         cancel = api_client.post(f"/api/jobs/cancel/{job_id}")
         assert cancel.status_code == 200
 
+    @patch("api_gateway_simple.forward_to_handbrake_service")
+    def test_cancel_finished_job_skips_handbrake(self, mock_fwd, api_client) -> None:
+        """Cancelling an already-cancelled job answers locally without forwarding."""
+        mock_fwd.return_value = True
+        add_resp = api_client.post(
+            "/api/jobs/add",
+            json={"input_path": "/in/d.mp4", "output_path": "/out/d.mkv"},
+        )
+        job_id = add_resp.get_json()["job_id"]
+        api_client.post(f"/api/jobs/cancel/{job_id}")
+        mock_fwd.reset_mock()
+
+        again = api_client.post(f"/api/jobs/cancel/{job_id}")
+        assert again.status_code == 200
+        assert again.get_json()["status"] == "cancelled"
+        mock_fwd.assert_not_called()
+
+    @patch("api_gateway_simple.forward_to_handbrake_service")
+    def test_cancel_unknown_job_returns_404(self, mock_fwd, api_client) -> None:
+        """Cancelling an unknown job returns 404 without forwarding."""
+        resp = api_client.post("/api/jobs/cancel/no-such-job")
+        assert resp.status_code == 404
+        mock_fwd.assert_not_called()
+
     @patch("api_gateway_simple.forward_to_handbrake_service")
     def test_delete_job_with_auth(self, mock_fwd, api_client, auth_headers) -> None:
         """DELETE /api/jobs/:id requires auth and proxies to HandBrake."""
@@ -277,6 +636,19 @@ class TestJobEndpoints:
         assert del_resp.status_code == 200
 
 
+def _wait_for_scan(api_client, auth_headers, scan_id, timeout=5.0) -> dict:
+    """Poll the scan status endpoint until the background scan finishes."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        data = api_client.get(
+            f"/api/filesystem/scan/{scan_id}", headers=auth_headers
+        ).get_json()["data"]
+        if data["status"] != "running":
+            return data
+        time.sleep(0.02)
+    raise AssertionError(f"scan {scan_id} did not finish")
+
+
 class TestFilesystemEndpoints:
     """Tests for /api/filesystem/browse and /api/filesystem/scan."""
 
@@ -305,6 +677,58 @@ class TestFilesystemEndpoints:
         )
         assert resp.status_code == 404
 
+    def test_browse_lists_dirs_and_file_sizes(
+        self, api_client, auth_headers, tmp_path
+    ) -> None:
+        """Directories sort first with size 0; files carry their size."""
+        root = tmp_path / "media"
+        (root / "b_dir").mkdir(parents=True)
+        (root / "a.mkv").write_bytes(b"12345")
+        (root / "B.mkv").write_bytes(b"")
+        (root / "b.mkv").write_bytes(b"")
+        resp = api_client.get(
+            f"/api/filesystem/browse?path={root}", headers=auth_headers
+        )
+        items = resp.get_json()["data"]["items"]
+        assert items[0]["name"] == ".."
+        assert [(i["name"], i["is_directory"], i["size"]) for i in items[1:]] == [
+            ("b_dir", True, 0),
+            ("a.mkv", False, 5),
+            ("B.mkv", False, 0),
+            ("b.mkv", False, 0),
+        ]
+        assert items[2]["path"] == str(root / "a.mkv")
+
+    def test_browse_cache_reused_until_directory_changes(
+        self, api_client, auth_headers, tmp_path
+    ) -> None:
+        """An unchanged directory is served from cache; a new entry invalidates it."""
+        gw = sys.modules["api_gateway_simple"]
+        root = tmp_path / "media"
+        root.mkdir()
+        url = f"/api/filesystem/browse?path={root}"
+        api_client.get(url, headers=auth_headers)
+        with patch.object(gw.os, "scandir", wraps=os.scandir) as scandir:
+            api_client.get(url, headers=auth_headers)
+            assert scandir.call_count == 0
+            (root / "new.mkv").write_bytes(b"")
+            os.utime(root, ns=(0, os.stat(root).st_mtime_ns + 1_000_000_000))
+            names = [
+                i["name"]
+                for i in api_client.get(url, headers=auth_headers).get_json()["data"]["items"]
+            ]
+        assert scandir.call_count == 1
+        assert "new.mkv" in names
+
+    def test_browse_file_path_returns_400(
+        self, api_client, auth_headers, tmp_path
+    ) -> None:
+        """Browsing a regular file is rejected as not a directory."""
+        f = tmp_path / "x.mkv"
+        f.write_bytes(b"")
+        resp = api_client.get(f"/api/filesystem/browse?path={f}", headers=auth_headers)
+        assert resp.status_code == 400
+
     def test_scan_requires_path(self, api_client, auth_headers) -> None:
         """POST /api/filesystem/scan without path returns 400."""
         resp = api_client.post(
@@ -312,16 +736,96 @@ class TestFilesystemEndpoints:
         )
         assert resp.status_code == 400
 
+    def test_scan_without_body_returns_400(self, api_client, auth_headers) -> None:
+        """POST /api/filesystem/scan with no JSON body returns 400, not 500."""
+        resp = api_client.post("/api/filesystem/scan", headers=auth_headers)
+        assert resp.status_code == 400
+
     def test_scan_existing_directory(
         self, api_client, auth_headers, tmp_path
     ) -> None:
-        """Scan of an existing directory returns success and file metadata."""
+        """Scan of an existing directory is accepted and completes in the background."""
+        (tmp_path / "a.mkv").write_bytes(b"")
         resp = api_client.post(
             "/api/filesystem/scan",
             headers=auth_headers,
             json={"path": str(tmp_path)},
         )
-        assert resp.status_code == 200
+        assert resp.status_code == 202
         data = resp.get_json()
         assert data.get("success") is True
-        assert "data" in data
+        scan = _wait_for_scan(api_client, auth_headers, data["data"]["scan_id"])
+        assert scan["status"] == "completed"
+        assert scan["file_count"] == 1
+
+    def test_scan_save_error_reports_failed(
+        self, api_client, auth_headers, tmp_path
+    ) -> None:
+        """A scan whose results cannot be saved finishes as failed, not completed."""
+        gw = sys.modules["api_gateway_simple"]
+        with patch.object(gw, "save_scan_to_db", side_effect=RuntimeError("disk full")):
+            scan_id = api_client.post(
+                "/api/filesystem/scan", headers=auth_headers, json={"path": str(tmp_path)}
+            ).get_json()["data"]["scan_id"]
+            scan = _wait_for_scan(api_client, auth_headers, scan_id)
+        assert scan["status"] == "failed"
+        assert scan["error"] == "disk full"
+
+    def test_startup_fails_interrupted_scans_and_prunes_old_ones(
+        self, api_client, auth_headers
+    ) -> None:
+        """init_job_database fails leftover running scans and drops expired rows."""
+        gw = sys.modules["api_gateway_simple"]
+        old = (datetime.now() - gw.SCAN_JOB_RETENTION - timedelta(hours=1)).isoformat()
+        with gw._db_pool.transaction() as conn:
+            conn.execute(
+                "INSERT INTO scan_jobs (id, path, status, started_at)"
+                " VALUES ('stale', '/x', 'running', ?)",
+                (old,),
+            )
+            conn.execute(
+                "INSERT INTO scan_jobs (id, path, status, started_at, completed_at)"
+                " VALUES ('expired', '/x', 'completed', ?, ?)",
+                (old, old),
+            )
+        gw.init_job_database()
+        stale = api_client.get("/api/filesystem/scan/stale", headers=auth_headers)
+        assert stale.get_json()["data"]["status"] == "failed"
+        expired = api_client.get("/api/filesystem/scan/expired", headers=auth_headers)
+        assert expired.status_code == 404
+
+    def test_scan_status_unknown_id_returns_404(self, api_client, auth_headers) -> None:
+        """GET /api/filesystem/scan/<id> for an unknown scan returns 404."""
+        resp = api_client.get("/api/filesystem/scan/missing", headers=auth_headers)
+        assert resp.status_code == 404
+
+    def test_scan_cache_returns_first_page(
+        self, api_client, auth_headers, tmp_path
+    ) -> None:
+        """GET /api/filesystem/cache returns the count and the first 100 cached files."""
+        for i in range(105):
+            (tmp_path / f"ep{i:03d}.mkv").write_bytes(b"")
+        scan_id = api_client.post(
+            "/api/filesystem/scan", headers=auth_headers, json={"path": str(tmp_path)}
+        ).get_json()["data"]["scan_id"]
+        _wait_for_scan(api_client, auth_headers, scan_id)
+        resp = api_client.get(
+            f"/api/filesystem/cache?path={tmp_path}", headers=auth_headers
+        )
+        assert resp.status_code == 200
+        data = resp.get_json()["data"]
+        assert data["file_count"] == 105
+        assert len(data["files"]) == 100
+        assert data["files"][0]["name"].endswith(".mkv")
+
+    def test_scan_walks_subdirectories(self, api_client, tmp_path) -> None:
+        """The recursive scan finds nested videos with paths relative to the root."""
+        gw = sys.modules["api_gateway_simple"]
+        (tmp_path / "show" / "s01").mkdir(parents=True)
+        (tmp_path / "show" / "s01" / "e01.MKV").write_bytes(b"abc")
+        (tmp_path / "show" / "notes.txt").write_bytes(b"")
+        (tmp_path / "show" / "mkv").write_bytes(b"")
+        (tmp_path / "movie.mp4").write_bytes(b"")
+        found = {r["relative_path"]: r for r in gw.scan_directory_recursive(str(tmp_path))}
+        assert set(found) == {"movie.mp4", os.path.join("show", "s01", "e01.MKV")}
+        assert found[os.path.join("show", "s01", "e01.MKV")]["size"] == 3
@@ -130,6 +130,39 @@ class TestAuthentication:
         assert "username" in user
         assert "role" in user
 
+    def test_authenticate_records_last_login(self, auth_service) -> None:
+        """A successful login commits last_login."""
+        import sqlite3
+
+        auth_service.authenticate_user("admin", "admin123")
+        conn = sqlite3.connect(auth_service.db_path)
+        try:
+            row = conn.execute(
+                "SELECT last_login FROM users WHERE username = 'admin'"
+            ).fetchone()
+        finally:
+            conn.close()
+        assert row[0] is not None
+        assert auth_service._pool._opened == 1
+
+    def test_password_check_runs_without_a_pool_connection(self, auth_service) -> None:
+        """bcrypt runs after the lookup connection is back in the pool."""
+        from unittest.mock import patch
+
+        import bcrypt
+
+        pool = auth_service._pool
+        idle_during_check = []
+        real_checkpw = bcrypt.checkpw
+
+        def checkpw(password, hashed):
+            idle_during_check.append(pool._idle.qsize() == pool._opened)
+            return real_checkpw(password, hashed)
+
+        with patch("auth.bcrypt.checkpw", side_effect=checkpw):
+            assert auth_service.authenticate_user("admin", "admin123") is not None
+        assert idle_during_check == [True]
+
     def test_authenticate_invalid_password(self, auth_service) -> None:
         """Wrong password returns None."""
         user = auth_service.authenticate_user("admin", "wrongpassword")
@@ -175,6 +208,40 @@ class TestTokens:
         assert verified is not None
         assert verified["username"] == "admin"
 
+    def test_sequential_calls_reuse_one_pooled_connection(self, auth_service) -> None:
+        """Back-to-back lookups borrow the same connection instead of reopening."""
+        user_info = auth_service.authenticate_user("admin", "admin123")
+        token = auth_service.create_token(user_info)
+        for _ in range(3):
+            assert auth_service.verify_token(token) is not None
+        assert auth_service._pool._opened == 1
+
+    def test_verify_token_caches_user_lookup(self, auth_service) -> None:
+        """A repeat verify within USER_CACHE_TTL skips the users query."""
+        from unittest.mock import patch
+
+        user_info = auth_service.authenticate_user("admin", "admin123")
+        token = auth_service.create_token(user_info)
+        assert auth_service.verify_token(token) is not None
+        with patch.object(auth_service._pool, "connection") as conn:
+            assert auth_service.verify_token(token)["username"] == "admin"
+        conn.assert_not_called()
+        auth_service.invalidate_user(user_info["id"])
+        assert user_info["id"] not in auth_service._user_cache
+
+    def test_repeated_token_skips_decode(self, auth_service) -> None:
+        """A token verified once is answered from the token cache until invalidated."""
+        from unittest.mock import patch
+
+        user_info = auth_service.authenticate_user("admin", "admin123")
+        token = auth_service.create_token(user_info)
+        assert auth_service.verify_token(token) is not None
+        with patch("auth.jwt.decode") as decode:
+            assert auth_service.verify_token(token)["username"] == "admin"
+        decode.assert_not_called()
+        auth_service.invalidate_user(user_info["id"])
+        assert not auth_service._token_cache
+
     def test_verify_invalid_token_returns_none(self, auth_service) -> None:
         """verify_token() with a garbage token returns None."""
         result = auth_service.verify_token("not.a.valid.token")
@@ -224,6 +291,19 @@ class TestTabCrud:
         names = [t["name"] for t in tabs]
         assert "Visible Tab" in names
 
+    def test_get_tab_returns_single_row(self, auth_service) -> None:
+        """get_tab() returns the created row, and None for an unknown id."""
+        tab_id = auth_service.create_tab(
+            name="Single",
+            source_path="/src",
+            destination_path="/dst",
+            source_type="tv",
+            profile="standard",
+            user_id=None,
+        )
+        assert auth_service.get_tab(tab_id)["name"] == "Single"
+        assert auth_service.get_tab(tab_id + 1000) is None
+
     def test_update_tab(self, auth_service) -> None:
         """update_tab() returns True and persists the change."""
         tab_id = auth_service.create_tab(
@@ -0,0 +1,26 @@
+"""Unit tests for shared/clock.py — cached ISO timestamps."""
+from __future__ import annotations
+
+import os
+import sys
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared import clock
+
+
+class TestIsoNow:
+    """Tests for iso_now."""
+
+    def test_formats_utc_seconds(self) -> None:
+        """iso_now() renders the current second as UTC ISO-8601."""
+        with patch.object(clock.time, "time", return_value=86400.7):
+            assert clock.iso_now() == "1970-01-02T00:00:00Z"
+
+    def test_reuses_string_within_the_same_second(self) -> None:
+        """Calls within one second return the same cached string object."""
+        with patch.object(clock.time, "time", return_value=1000.1):
+            first = clock.iso_now()
+        with patch.object(clock.time, "time", return_value=1000.9):
+            assert clock.iso_now() is first
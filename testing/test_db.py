@@ -10,7 +10,12 @@ import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from shared.db import commit_with_retry, execute_with_retry, get_db_connection
+from shared.db import (
+    ConnectionPool,
+    commit_with_retry,
+    execute_with_retry,
+    get_db_connection,
+)
 
 
 class TestGetDbConnection:
@@ -36,6 +41,16 @@ class TestGetDbConnection:
         finally:
             conn.close()
 
+    def test_wal_mode_persists_for_later_connections(self, tmp_path) -> None:
+        """Connections after the first skip the PRAGMA but still see WAL."""
+        db_path = str(tmp_path / "test.db")
+        get_db_connection(db_path).close()
+        conn = get_db_connection(db_path)
+        try:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        finally:
+            conn.close()
+
     def test_busy_timeout_set(self, tmp_path) -> None:
         """Connection has busy_timeout at least 5000 ms (implementation may be higher)."""
         db_path = str(tmp_path / "test.db")
@@ -119,3 +134,47 @@ class TestGetDbConnection:
             t.join(timeout=10)
 
         assert not errors, f"Concurrent write errors: {errors}"
+
+
+class TestConnectionPool:
+    """Tests for ConnectionPool."""
+
+    def test_reuses_returned_connection(self, tmp_path) -> None:
+        """A returned connection is handed to the next caller."""
+        pool = ConnectionPool(str(tmp_path / "pool.db"), size=2)
+        with pool.connection() as first:
+            pass
+        with pool.connection() as second:
+            assert second is first
+        pool.close()
+
+    def test_transaction_commits_and_rolls_back(self, tmp_path) -> None:
+        """transaction() commits on success and rolls back on error."""
+        pool = ConnectionPool(str(tmp_path / "pool.db"), size=1)
+        with pool.transaction() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pytest.raises(RuntimeError):
+            with pool.transaction() as conn:
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("boom")
+        with pool.connection() as conn:
+            assert [row[0] for row in conn.execute("SELECT x FROM t")] == [1]
+        pool.close()
+
+    def test_blocks_when_exhausted(self, tmp_path) -> None:
+        """Callers beyond size wait for a connection instead of opening more."""
+        pool = ConnectionPool(str(tmp_path / "pool.db"), size=1)
+        acquired = threading.Event()
+
+        def borrow() -> None:
+            with pool.connection():
+                acquired.set()
+
+        with pool.connection():
+            worker = threading.Thread(target=borrow)
+            worker.start()
+            assert not acquired.wait(timeout=0.2)
+        worker.join(timeout=5)
+        assert acquired.is_set()
+        pool.close()
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import os
 import sys
+import time
 from unittest.mock import patch
 
 import pytest
@@ -34,6 +35,45 @@ class TestHealthEndpoint:
         data = resp.get_json()
         assert data.get("service") == "handbrake"
 
+    def test_health_revalidates_with_etag(self, handbrake_client) -> None:
+        """Live usage samples alone do not change the ETag; the poll gets a 304."""
+        first = handbrake_client.get("/health")
+        etag = first.headers["ETag"]
+        again = handbrake_client.get("/health", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.get_data() == b""
+
+    def test_health_etag_changes_when_headroom_does(self, handbrake_client) -> None:
+        """Small usage moves keep the ETag; crossing a start threshold changes it."""
+        samples = iter(
+            [
+                {"cpu_percent": 12.3, "memory_percent": 40.1, "disk_free_gb": 50.2},
+                {"cpu_percent": 57.9, "memory_percent": 41.7, "disk_free_gb": 50.1},
+                {"cpu_percent": 93.4, "memory_percent": 41.7, "disk_free_gb": 50.1},
+            ]
+        )
+        with patch(
+            "handbrake_service_simple.get_system_usage",
+            side_effect=lambda: next(samples),
+        ):
+            etags = [handbrake_client.get("/health").headers["ETag"] for _ in range(3)]
+        assert etags[0] == etags[1]
+        assert etags[2] != etags[1]
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics."""
+
+    def test_metrics_exposes_gauges(self, handbrake_client) -> None:
+        """Metrics are served in Prometheus text format."""
+        resp = handbrake_client.get("/metrics")
+        assert resp.status_code == 200
+        assert resp.mimetype == "text/plain"
+        body = resp.get_data(as_text=True)
+        assert "# TYPE h2r_cpu_percent gauge" in body
+        assert "\nh2r_running_jobs 0\n" in body
+        assert "h2r_queue_size" not in body
+
 
 class TestConvertEndpoint:
     """Tests for POST /convert."""
@@ -83,6 +123,76 @@ class TestConvertEndpoint:
         )
         assert resp.status_code == 503
 
+    @patch("handbrake_service_simple.run_handbrake_conversion")
+    @patch("handbrake_service_simple.available_job_slots", return_value=8)
+    def test_bulk_convert_saves_valid_rows(
+        self, _mock_slots, _mock_run_conv, handbrake_client
+    ) -> None:
+        """POST /convert/bulk reports per-row errors and saves the valid jobs."""
+        resp = handbrake_client.post(
+            "/convert/bulk",
+            json=[
+                {"job_id": "bulk-1", "input_path": "/media/input/a.mp4"},
+                {"job_id": "bulk-2", "input_path": "/etc/passwd"},
+                {"job_id": "bulk-3", "input_path": "/media/input/b.mp4"},
+            ],
+        )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["count"] == 2
+        assert [r["job_id"] for r in data["results"]] == ["bulk-1", "bulk-2", "bulk-3"]
+        assert data["results"][1]["error"]
+        assert handbrake_client.get("/job/bulk-3").status_code == 200
+
+    @patch("handbrake_service_simple.run_handbrake_conversion")
+    @patch("handbrake_service_simple.available_job_slots", return_value=1)
+    def test_bulk_convert_admits_only_free_slots(
+        self, _mock_slots, mock_run_conv, handbrake_client
+    ) -> None:
+        """Rows beyond the free job slots are reported overloaded, not started."""
+        resp = handbrake_client.post(
+            "/convert/bulk",
+            json=[
+                {"job_id": "slot-1", "input_path": "/media/input/a.mp4"},
+                {"job_id": "slot-2", "input_path": "/media/input/b.mp4"},
+            ],
+        )
+        assert resp.status_code == 200
+        data = resp.get_json()
+        assert data["count"] == 1
+        assert data["results"][0]["error"] is None
+        assert data["results"][1]["error"] == "System resources are currently at capacity"
+        assert mock_run_conv.call_count == 1
+        assert handbrake_client.get("/job/slot-2").status_code == 404
+
+    @patch("handbrake_service_simple.run_handbrake_conversion")
+    @patch("handbrake_service_simple.available_job_slots", return_value=8)
+    def test_bulk_convert_rows_without_id_get_distinct_ids(
+        self, _mock_slots, mock_run_conv, handbrake_client
+    ) -> None:
+        """Id-less rows in one batch each get their own job id."""
+        resp = handbrake_client.post(
+            "/convert/bulk",
+            json=[
+                {"input_path": "/media/input/a.mp4"},
+                {"input_path": "/media/input/b.mp4"},
+            ],
+        )
+        assert resp.status_code == 200
+        ids = [r["job_id"] for r in resp.get_json()["results"]]
+        assert len(set(ids)) == 2
+        started = {call.args[0].id for call in mock_run_conv.call_args_list}
+        assert started == set(ids)
+        for job_id in ids:
+            assert handbrake_client.get(f"/job/{job_id}").status_code == 200
+
+    def test_bulk_convert_requires_array(self, handbrake_client) -> None:
+        """A non-array body is rejected with 400."""
+        resp = handbrake_client.post(
+            "/convert/bulk", json={"input_path": "/media/input/a.mp4"}
+        )
+        assert resp.status_code == 400
+
 
 class TestJobManagement:
     """Tests for job status, listing, cancellation, and deletion endpoints."""
@@ -100,6 +210,21 @@ class TestJobManagement:
         assert "jobs" in data
         assert isinstance(data["jobs"], list)
 
+    def test_list_jobs_keeps_stored_timestamps(self, handbrake_client) -> None:
+        """Listed jobs carry the saved created_at and the to_dict() keys."""
+        import handbrake_service_simple as hb  # type: ignore[import]
+        from datetime import datetime
+
+        job = hb.ConversionJob(
+            id="listed-1",
+            input_path="/media/input/a.mp4",
+            output_path="/media/output/a.mkv",
+            created_at=datetime(2024, 1, 2, 3, 4, 5),
+        )
+        hb.save_job_to_db(job)
+        listed = {j["id"]: j for j in hb.get_all_jobs_from_db()}
+        assert listed["listed-1"] == job.to_dict()
+
     def test_cancel_nonexistent_job_returns_404(self, handbrake_client) -> None:
         """POST /cancel/<id> for unknown job returns 404."""
         resp = handbrake_client.post("/cancel/nonexistent-id")
@@ -170,6 +295,25 @@ class TestSystemUsageAndGating:
         assert "cpu_percent" in usage
         assert "memory_percent" in usage
 
+    def test_get_system_usage_does_not_block_on_cpu_sampling(self) -> None:
+        """get_system_usage reads the sampled CPU value instead of sleeping."""
+        import handbrake_service_simple as hb  # type: ignore[import]
+
+        start = time.monotonic()
+        hb.get_system_usage()
+        assert time.monotonic() - start < hb.CPU_SAMPLE_INTERVAL
+        assert hb._cpu_sampler_thread is not None
+
+    def test_get_system_usage_reuses_reading_within_ttl(self) -> None:
+        """Memory and disk are read once per SYSTEM_USAGE_TTL across calls."""
+        import handbrake_service_simple as hb  # type: ignore[import]
+
+        hb._usage_cache["checked_at"] = float("-inf")
+        with patch.object(hb.psutil, "virtual_memory", wraps=hb.psutil.virtual_memory) as vm:
+            hb.get_system_usage()
+            hb.get_system_usage()
+        assert vm.call_count == 1
+
     @patch("handbrake_service_simple.get_system_usage")
     def test_can_start_job_false_when_cpu_saturated(self, mock_usage) -> None:
         """can_start_job returns False when CPU usage is above threshold."""
@@ -2,16 +2,27 @@
 from __future__ import annotations
 
 import os
+import sqlite3
+import subprocess
 import sys
+import threading
+import time
+from dataclasses import fields
 from datetime import datetime
 
 import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from unittest.mock import patch
+from unittest.mock import PropertyMock, patch
 
-from shared.job_queue import ConversionJob, JobQueue, JobStatus, ResourceMonitor
+from shared.job_queue import (
+    STATUS_BY_VALUE,
+    ConversionJob,
+    JobQueue,
+    JobStatus,
+    ResourceMonitor,
+)
 
 
 class TestJobStatus:
@@ -29,6 +40,11 @@ class TestJobStatus:
             assert isinstance(status.value, str)
             assert status.value == status.value.lower()
 
+    def test_status_by_value_covers_every_member(self) -> None:
+        """STATUS_BY_VALUE maps each stored string back to its member."""
+        assert STATUS_BY_VALUE == {s.value: s for s in JobStatus}
+        assert STATUS_BY_VALUE["retrying"] is JobStatus.RETRYING
+
 
 class TestConversionJob:
     """Tests for the ConversionJob dataclass."""
@@ -94,6 +110,32 @@ class TestConversionJob:
         for key in ("id", "input_path", "output_path", "status", "progress", "created_at"):
             assert key in d, f"Missing key: {key}"
 
+    def test_to_dict_covers_every_field(self) -> None:
+        """to_dict() emits exactly one key per dataclass field."""
+        job = ConversionJob(id="j", input_path="/in", output_path="/out")
+        assert set(job.to_dict()) == {f.name for f in fields(ConversionJob)}
+
+    def test_from_row_reads_columns_by_name(self) -> None:
+        """from_row() maps a jobs-table Row, including stored timestamps."""
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        row = conn.execute(
+            """
+            SELECT 'j' AS id, '/in' AS input_path, '/out' AS output_path,
+                   20 AS quality, '1280x720' AS resolution,
+                   1000 AS video_bitrate, 96 AS audio_bitrate,
+                   'running' AS status, 42.5 AS progress,
+                   NULL AS error_message, 0 AS retry_count, 3 AS max_retries,
+                   '2024-01-02 03:04:05' AS created_at,
+                   NULL AS started_at, NULL AS completed_at
+            """
+        ).fetchone()
+        job = ConversionJob.from_row(row)
+        assert job.status == JobStatus.RUNNING
+        assert job.progress == 42.5
+        assert job.created_at == datetime(2024, 1, 2, 3, 4, 5)
+        assert job.started_at is None
+
 
 class TestResourceMonitor:
     """Tests for ResourceMonitor system resource checks."""
@@ -151,6 +193,40 @@ class TestResourceMonitor:
         assert isinstance(count, int)
         assert count >= 1
 
+    def test_started_monitor_serves_cached_snapshot(self) -> None:
+        """After start(), get_system_usage() reads the cache, not psutil."""
+        monitor = self._make_monitor()
+        monitor.start()
+        try:
+            snapshot = monitor.get_system_usage()
+            with patch("shared.job_queue.psutil.cpu_percent") as mock_cpu:
+                assert monitor.get_system_usage() is snapshot
+            mock_cpu.assert_not_called()
+        finally:
+            monitor.stop()
+
+    def test_sampler_publishes_resources_available(self) -> None:
+        """Each refresh sets or clears the resources_available flag."""
+        monitor = self._make_monitor()
+        busy = {
+            "cpu_percent": 99.0,
+            "memory_percent": 10.0,
+            "memory_available_gb": 8.0,
+            "disk_percent": 10.0,
+            "disk_free_gb": 100.0,
+        }
+        idle = {**busy, "cpu_percent": 5.0}
+        with patch.object(monitor, "_sample", side_effect=[idle, busy, idle]):
+            monitor.start()
+            try:
+                assert monitor.ok is True
+                monitor.refresh()
+                assert monitor.ok is False
+                monitor.refresh()
+                assert monitor.resources_available.is_set()
+            finally:
+                monitor.stop()
+
 
 class TestJobQueue:
     """Tests for JobQueue with worker threads disabled."""
@@ -200,3 +276,159 @@ class TestJobQueue:
             assert jq.get_queue_status()["queue_size"] >= 1
         finally:
             jq.shutdown()
+
+    @patch.object(JobQueue, "_start_workers", lambda self: None)
+    @patch.object(JobQueue, "WRITE_FLUSH_INTERVAL", 60)
+    def test_progress_updates_coalesce_into_one_row(self, tmp_path) -> None:
+        """Several queued updates for one job are written once, latest wins."""
+        db_path = str(tmp_path / "jq3.db")
+        jq = JobQueue(self._fake_config(db_path), db_path)
+        try:
+            job = ConversionJob(
+                id="jid-2",
+                input_path="/in/b.mp4",
+                output_path="/out/b.mkv",
+            )
+            for progress in (10.0, 20.0, 30.0):
+                jq._update_job_progress(job, progress)
+            assert list(jq._pending_writes) == ["jid-2"]
+            jq.flush_writes()
+            with sqlite3.connect(db_path) as conn:
+                rows = conn.execute("SELECT id, progress FROM jobs").fetchall()
+            assert rows == [("jid-2", 30.0)]
+        finally:
+            jq.shutdown()
+
+    @patch.object(JobQueue, "_start_workers", lambda self: None)
+    def test_deferred_job_requeued_when_due(self, tmp_path) -> None:
+        """Deferred jobs stay off the queue until ready, then the scheduler re-queues them."""
+        db_path = str(tmp_path / "jq5.db")
+        jq = JobQueue(self._fake_config(db_path), db_path)
+        try:
+            job = ConversionJob(id="jid-3", input_path="/in/c.mp4", output_path="/out/c.mkv")
+            with patch.object(
+                ResourceMonitor, "ok", new_callable=PropertyMock, return_value=True
+            ):
+                jq._defer_job(job, 60)
+                assert jq.get_queue_status()["deferred_jobs"] == 1
+                assert jq.job_queue.qsize() == 0
+                jq._defer_job(job, 0)
+                assert jq.job_queue.get(timeout=2) is job
+        finally:
+            jq.shutdown()
+
+    @patch.object(JobQueue, "_start_workers", lambda self: None)
+    @patch.object(JobQueue, "WRITE_FLUSH_INTERVAL", 60)
+    def test_run_conversion_streams_progress(self, tmp_path) -> None:
+        """Progress lines ending in \\r are parsed while the process runs."""
+        db_path = str(tmp_path / "jq6.db")
+        jq = JobQueue(self._fake_config(db_path), db_path)
+        script = (
+            "import sys\n"
+            "sys.stdout.write('Encoding: task 1 of 1, 12.50 %\\r')\n"
+            "sys.stdout.write('Encoding: task 1 of 1, 99.00 %\\r')\n"
+            "sys.stdout.write('done\\n')\n"
+        )
+        real_popen = subprocess.Popen
+
+        def fake_popen(cmd, **kwargs):
+            kwargs.pop("cwd", None)
+            return real_popen([sys.executable, "-c", script], **kwargs)
+
+        try:
+            job = ConversionJob(
+                id="jid-4",
+                input_path="/in/d.mp4",
+                output_path=str(tmp_path / "out" / "d.mkv"),
+            )
+            with patch("shared.job_queue.subprocess.Popen", side_effect=fake_popen):
+                assert jq._run_conversion(job) is True
+            assert job.progress == 99.0
+            assert jq._pending_writes
+            assert jq._processes == {}
+        finally:
+            jq.shutdown()
+
+    @patch.object(JobQueue, "_start_workers", lambda self: None)
+    @patch.object(JobQueue, "WRITE_FLUSH_INTERVAL", 60)
+    def test_cancel_mid_run_is_not_retried(self, tmp_path) -> None:
+        """Cancelling a running job stops its process and keeps it CANCELLED."""
+        db_path = str(tmp_path / "jq7.db")
+        jq = JobQueue(self._fake_config(db_path), db_path)
+        real_popen = subprocess.Popen
+
+        def fake_popen(cmd, **kwargs):
+            kwargs.pop("cwd", None)
+            return real_popen(
+                [sys.executable, "-c", "import time; time.sleep(30)"], **kwargs
+            )
+
+        try:
+            job = ConversionJob(
+                id="jid-5",
+                input_path="/in/e.mp4",
+                output_path=str(tmp_path / "out" / "e.mkv"),
+            )
+            jq.running_jobs = {job.id: job}
+            with patch("shared.job_queue.subprocess.Popen", side_effect=fake_popen):
+                worker = threading.Thread(target=jq._process_job, args=(job,))
+                worker.start()
+                deadline = time.monotonic() + 10
+                while job.id not in jq._processes and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                assert jq.cancel_job(job.id) is True
+                worker.join(timeout=10)
+            assert not worker.is_alive()
+            assert job.status is JobStatus.CANCELLED
+            assert job.retry_count == 0
+            assert jq.get_queue_status()["deferred_jobs"] == 0
+            jq.flush_writes()
+            with sqlite3.connect(db_path) as conn:
+                row = conn.execute(
+                    "SELECT status FROM jobs WHERE id = ?", (job.id,)
+                ).fetchone()
+            assert row == ("cancelled",)
+        finally:
+            jq.shutdown()
+
+    @patch.object(JobQueue, "_start_workers", lambda self: None)
+    @patch.object(JobQueue, "WRITE_FLUSH_INTERVAL", 60)
+    def test_cancel_before_popen_stops_the_process(self, tmp_path) -> None:
+        """A cancel landing before the process is registered still stops it."""
+        db_path = str(tmp_path / "jq8.db")
+        jq = JobQueue(self._fake_config(db_path), db_path)
+        real_popen = subprocess.Popen
+        job = ConversionJob(
+            id="jid-6",
+            input_path="/in/f.mp4",
+            output_path=str(tmp_path / "out" / "f.mkv"),
+        )
+
+        def fake_popen(cmd, **kwargs):
+            # The job is RUNNING but has no process to signal yet
+            assert jq.cancel_job(job.id) is True
+            kwargs.pop("cwd", None)
+            return real_popen(
+                [sys.executable, "-c", "import time; time.sleep(30)"], **kwargs
+            )
+
+        try:
+            jq.running_jobs = {job.id: job}
+            with patch("shared.job_queue.subprocess.Popen", side_effect=fake_popen):
+                worker = threading.Thread(target=jq._process_job, args=(job,))
+                worker.start()
+                worker.join(timeout=10)
+            assert not worker.is_alive()
+            assert job.status is JobStatus.CANCELLED
+            assert jq._processes == {}
+        finally:
+            jq.shutdown()
+
+    def test_shutdown_wakes_idle_workers(self, tmp_path) -> None:
+        """Idle workers block on the queue and exit on the shutdown sentinel."""
+        db_path = str(tmp_path / "jq4.db")
+        jq = JobQueue(self._fake_config(db_path), db_path)
+        workers = list(jq.worker_threads)
+        assert workers and all(w.is_alive() for w in workers)
+        jq.shutdown()
+        assert not any(w.is_alive() for w in workers)
@@ -0,0 +1,71 @@
+"""Unit tests for shared/json_utils.py — orjson-backed Flask JSON provider."""
+from __future__ import annotations
+
+import decimal
+import os
+import sys
+
+from flask import Flask, jsonify, request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.json_utils import (
+    OrjsonProvider,
+    SocketIOJSON,
+    dumps_bytes,
+    orjson_response,
+)
+
+
+class TestDumpsBytes:
+    """Tests for dumps_bytes."""
+
+    def test_returns_compact_bytes(self) -> None:
+        """Output is compact UTF-8 JSON bytes."""
+        assert dumps_bytes({"a": 1, "b": [1, 2]}) == b'{"a":1,"b":[1,2]}'
+
+    def test_handles_non_native_types(self) -> None:
+        """Decimal, sets and integer keys serialize like the stdlib provider."""
+        out = dumps_bytes({1: decimal.Decimal("1.5"), "s": {3}})
+        assert out == b'{"1":"1.5","s":[3]}'
+
+
+class TestOrjsonProvider:
+    """Tests for OrjsonProvider wired into a Flask app."""
+
+    def test_jsonify_and_get_json_round_trip(self) -> None:
+        """jsonify responses and request parsing both go through orjson."""
+        app = Flask(__name__)
+        app.json = OrjsonProvider(app)
+
+        @app.route("/echo", methods=["POST"])
+        def echo():
+            return jsonify(body=request.get_json())
+
+        resp = app.test_client().post("/echo", json={"name": "tab"})
+        assert resp.status_code == 200
+        assert resp.mimetype == "application/json"
+        assert resp.get_json() == {"body": {"name": "tab"}}
+
+
+class TestSocketIOJSON:
+    """Tests for the json-module shim handed to Socket.IO."""
+
+    def test_accepts_stdlib_keyword_arguments(self) -> None:
+        """dumps/loads ignore stdlib kwargs such as separators."""
+        text = SocketIOJSON.dumps({"a": [1]}, separators=(",", ":"))
+        assert text == '{"a":[1]}'
+        assert SocketIOJSON.loads(text) == {"a": [1]}
+
+
+class TestOrjsonResponse:
+    """Tests for orjson_response."""
+
+    def test_builds_json_response_with_status(self) -> None:
+        """The body is orjson bytes and the status code is passed through."""
+        app = Flask(__name__)
+        with app.app_context():
+            resp = orjson_response({"ok": False}, status=503)
+        assert resp.status_code == 503
+        assert resp.mimetype == "application/json"
+        assert resp.get_data() == b'{"ok":false}'
@@ -0,0 +1,62 @@
+"""Unit tests for shared/logging_setup.py — buffered queue log sink."""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared.logging_setup import AccessLogPathFilter, _BufferedStreamHandler
+
+
+def _record(msg: str) -> logging.LogRecord:
+    return logging.LogRecord("t", logging.INFO, __file__, 1, msg, None, None)
+
+
+class TestBufferedStreamHandler:
+    """Tests for the listener-side handler's flush policy."""
+
+    def test_flushes_when_queue_is_drained(self) -> None:
+        """A lone record is flushed straight away."""
+        stream = MagicMock()
+        handler = _BufferedStreamHandler(stream, queue.SimpleQueue())
+        handler.emit(_record("hello"))
+        stream.write.assert_called_once_with("hello\n")
+        stream.flush.assert_called_once()
+
+    def test_batches_while_records_are_queued(self) -> None:
+        """With a backlog, small records are buffered until FLUSH_BYTES."""
+        stream = MagicMock()
+        backlog: queue.SimpleQueue = queue.SimpleQueue()
+        backlog.put(object())
+        handler = _BufferedStreamHandler(stream, backlog)
+        handler.FLUSH_INTERVAL = 60
+        handler.emit(_record("small"))
+        stream.flush.assert_not_called()
+        handler.emit(_record("x" * handler.FLUSH_BYTES))
+        stream.flush.assert_called_once()
+
+
+class TestAccessLogPathFilter:
+    """Tests for the Werkzeug access-log path filter."""
+
+    @staticmethod
+    def _access_record(request_line: str) -> logging.LogRecord:
+        return logging.LogRecord(
+            "werkzeug", logging.INFO, __file__, 1, '"%s" %s %s', (request_line, "200", "-"), None
+        )
+
+    def test_drops_listed_paths_and_prefixes(self) -> None:
+        """Exact paths (ignoring the query) and prefixes are filtered out."""
+        f = AccessLogPathFilter(paths=("/health",), prefixes=("/socket.io/",))
+        assert not f.filter(self._access_record("GET /health?deep=1 HTTP/1.1"))
+        assert not f.filter(self._access_record("GET /socket.io/?EIO=4 HTTP/1.1"))
+        assert f.filter(self._access_record("GET /api/jobs/list HTTP/1.1"))
+
+    def test_keeps_non_access_records(self) -> None:
+        """Records without a request-line argument pass through."""
+        f = AccessLogPathFilter(paths=("/health",))
+        assert f.filter(_record("/health"))
@@ -16,6 +16,10 @@ import { useMutation, useQuery, useQueryClient } from 'react-query';
 import { tabsAPI, filesystemAPI } from '../services/api';
 import FileBrowser from './common/FileBrowser';
 
+const SCAN_POLL_INTERVAL_MS = 1000;
+// Give up on a scan that has not finished after this long
+const SCAN_POLL_TIMEOUT_MS = 30 * 60 * 1000;
+
 const Sidebar = () => {
   const [expandedTabs, setExpandedTabs] = useState(new Set());
   const [expandedShows, setExpandedShows] = useState(new Set());
@@ -122,6 +126,19 @@ const Sidebar = () => {
     }
   };
 
+  const waitForScan = async (scanId) => {
+    // Scans run in the background on the gateway; poll until it finishes
+    const deadline = Date.now() + SCAN_POLL_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, SCAN_POLL_INTERVAL_MS));
+      const status = await filesystemAPI.scanStatus(scanId);
+      if (status.data.status !== 'running') {
+        return status.data;
+      }
+    }
+    throw new Error('Timed out waiting for the scan to finish');
+  };
+
   const handleScan = async (path) => {
     if (!path) return;
     
@@ -129,12 +146,17 @@ const Sidebar = () => {
     try {
       const response = await filesystemAPI.scan(path);
       if (response.success) {
+        const scan = await waitForScan(response.data.scan_id);
+        if (scan.status === 'failed') {
+          throw new Error(scan.error || 'Scan failed');
+        }
+        const cached = await filesystemAPI.getCachedContent(path);
         setScanCaches(prev => ({
           ...prev,
           [path]: {
-            last_scanned: new Date().toISOString(),
-            file_count: response.data.file_count,
-            files: response.data.files
+            last_scanned: scan.completed_at || new Date().toISOString(),
+            file_count: scan.file_count,
+            files: cached.success ? cached.data.files : []
           }
         }));
         toast.success(`Scan complete for ${path}`);
@@ -24,7 +24,8 @@
  * | systemAPI.getHealth               | GET    | /health                                | 200       |
  * | systemAPI.getSystemLoad           | GET    | /api/system/load                       | 200       |
  * | filesystemAPI.browse              | GET    | /api/filesystem/browse                 | 200       |
- * | filesystemAPI.scan                | POST   | /api/filesystem/scan                   | 200       |
+ * | filesystemAPI.scan                | POST   | /api/filesystem/scan                   | 202       |
+ * | filesystemAPI.scanStatus(id)      | GET    | /api/filesystem/scan/<scan_id>         | 200 / 404 |
  * | filesystemAPI.mkdir               | POST   | /api/filesystem/mkdir                  | 200       |
  * | filesystemAPI.getCachedContent    | GET    | /api/filesystem/cache                  | 200 / 404 |
  *
@@ -112,6 +113,7 @@ export const filesystemAPI = {
   roots: () => api.get('/api/filesystem/roots'),
   browse: (path) => api.get('/api/filesystem/browse', { params: { path } }),
   scan: (path) => api.post('/api/filesystem/scan', { path }),
+  scanStatus: (scanId) => api.get(`/api/filesystem/scan/${scanId}`),
   mkdir: (path, name) => api.post('/api/filesystem/mkdir', { path, name }),
   getCachedContent: (path) => api.get('/api/filesystem/cache', { params: { path } }),
 };